@@ -33,6 +33,7 @@ class Settings(BaseSettings):
     model_update_interval: int = 3600  # seconds
     prediction_horizon: int = 24  # hours
     confidence_threshold: float = 0.7
+    prediction_cache_ttl: int = 30  # seconds; 0 disables the live prediction cache
     
     # Geographic Configuration
     default_latitude: float = 20.5937
@@ -52,6 +53,7 @@ class Settings(BaseSettings):
     s3_bucket: Optional[str] = None
     
     # Monitoring
+    metrics_enabled: bool = True
     prometheus_port: int = 9090
     grafana_port: int = 3001
     
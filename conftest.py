@@ -0,0 +1,31 @@
+"""
+Shared pytest fixtures for the live API test suite.
+"""
+
+import asyncio
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop for the whole session so async fixtures can be shared."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def model():
+    """Prediction model, loaded once per test session."""
+    from src.api.routes.predictions import get_model_instance
+    return get_model_instance()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def http():
+    """Shared aiohttp session for tests that call external services."""
+    async with aiohttp.ClientSession() as session:
+        yield session
@@ -0,0 +1,28 @@
+"""
+One-shot conversion of data/karnataka_power_outage_dataset.csv to Parquet.
+The training pipeline reads the Parquet copy when it exists.
+"""
+
+import pandas as pd
+from pathlib import Path
+
+
+def main():
+    csv_path = Path("data/karnataka_power_outage_dataset.csv")
+    parquet_path = csv_path.with_suffix(".parquet")
+    if not csv_path.exists():
+        print(f"[ERROR] Dataset not found: {csv_path}")
+        print("Run: python data/karnataka_data_loader.py")
+        return 1
+
+    print(f"[INFO] Reading {csv_path}")
+    df = pd.read_csv(csv_path, parse_dates=["timestamp"], low_memory=False)
+
+    # pyarrow dictionary-encodes the repetitive city/escom_zone strings on its own
+    df.to_parquet(parquet_path, engine="pyarrow", compression="zstd", index=False)
+    print(f"[OK] Wrote {len(df):,} rows to {parquet_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,8 +4,8 @@ from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
 import logging
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-from starlette.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from starlette.responses import StreamingResponse
 
 from config.settings import settings
 from src.api.routes import predictions, heatmap, advisories, simulation, metrics
@@ -13,6 +13,7 @@ from src.api.routes import weather as weather_routes
 from src.api.middleware import rate_limit_middleware, logging_middleware
 from src.utils.database import init_database
 from src.utils.logger import setup_logging
+from src.utils.monitoring import performance_monitor, stream_metrics
 
 # Setup logging
 setup_logging()
@@ -25,9 +26,11 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting 24-Hour Power Outage Forecasting System")
     await init_database()
+    await performance_monitor.start()
     yield
     # Shutdown
     logger.info("Shutting down application")
+    await performance_monitor.stop()
 
 
 # Create FastAPI application
@@ -69,7 +72,7 @@ async def health_check():
 @app.get("/metrics", tags=["Monitoring"])
 async def get_metrics():
     """Prometheus metrics endpoint."""
-    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    return StreamingResponse(stream_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 
 # Include API routes
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Request
 from typing import List, Dict, Any
+import copy
+import hashlib
+import json
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+from cachetools import TTLCache
 
 from src.api.models import (
     PredictionRequest, PredictionResponse, RiskLevel, LivePredictionRequest
 )
-from src.models.ensemble_model import EnsemblePredictor
 # Simple in-memory cache to avoid Redis dependency issues
 _simple_cache = {}
 
@@ -20,21 +25,24 @@ async def set_cache(key: str, value, ttl=None):
     return True
 
 from src.utils.monitoring import track_prediction_request
+from config.settings import settings
+
+# Short-lived cache of model outputs for identical live prediction inputs
+_prediction_cache = (
+    TTLCache(maxsize=1024, ttl=settings.prediction_cache_ttl)
+    if settings.prediction_cache_ttl > 0 else None
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Global model instance - will be loaded lazily
-ensemble_model = None
-model_loaded = False
-
+@lru_cache(maxsize=1)
 def get_model_instance():
-    """Get the model instance, loading it lazily if needed."""
-    global ensemble_model, model_loaded
-    
-    if model_loaded:
-        return ensemble_model
+    """Get the model instance, loading it once on first use.
     
+    The TensorFlow-backed EnsemblePredictor is imported only when the sklearn
+    package is unavailable, so importing this module stays cheap.
+    """
     try:
         import os
         import joblib
@@ -52,22 +60,39 @@ def get_model_instance():
             class SklearnModelAdapter:
                 def __init__(self, model_package):
                     self.model = model_package['ensemble_model']
-                    self.scaler = model_package['scaler'] 
+                    self.scaler = model_package.get('scaler')  # Only in packages saved before scaling was dropped
                     self.feature_columns = model_package['feature_columns']
                     self.city_map = model_package['city_map']
                     self.escom_map = model_package['escom_map']
                     self.is_trained = True
                 
                 async def predict(self, input_data, include_explanation=True):
-                    weather = input_data['weather']
-                    grid = input_data['grid']
-                    
+                    return (await self.predict_batch([input_data], include_explanation))[0]
+                
+                async def predict_batch(self, inputs, include_explanation=True):
+                    """Score several inputs with one predict_proba call."""
+                    if not inputs:
+                        return []
+                    features = np.array([self._features(d['weather'], d['grid']) for d in inputs], dtype=np.float32)
+                    if self.scaler is not None:
+                        features = self.scaler.transform(features)
+                    probas = self.model.predict_proba(features)[:, 1] * 100
+                    return [
+                        {
+                            'risk_score': float(proba),
+                            'confidence_interval': {'lower': max(0, proba-10), 'upper': min(100, proba+10)},
+                            'contributing_factors': self._get_factors(d['weather'], d['grid'], proba)
+                        }
+                        for d, proba in zip(inputs, probas)
+                    ]
+                
+                def _features(self, weather, grid):
                     # Map city if provided, default to Bengaluru
                     city_encoded = self.city_map.get('Bengaluru', 0)
                     escom_encoded = self.escom_map.get('BESCOM', 0)
                     
-                    # Prepare features matching training format
-                    features = [
+                    # Features matching training format
+                    return [
                         weather.get('temperature', 25),
                         weather.get('humidity', 60),
                         weather.get('wind_speed', 10),
@@ -90,16 +115,6 @@ def get_model_instance():
                         city_encoded,
                         escom_encoded
                     ]
-                    
-                    # Scale features and predict
-                    features_scaled = self.scaler.transform([features])
-                    proba = self.model.predict_proba(features_scaled)[0][1] * 100
-                    
-                    return {
-                        'risk_score': float(proba),
-                        'confidence_interval': {'lower': max(0, proba-10), 'upper': min(100, proba+10)},
-                        'contributing_factors': self._get_factors(weather, grid, proba)
-                    }
                 
                 def _get_factors(self, weather, grid, risk_score):
                     factors = []
@@ -122,6 +137,7 @@ def get_model_instance():
             logger.info(f"Model accuracy: {model_package['model_info']['accuracy']:.3f}")
         else:
             # Fallback to original ensemble model
+            from src.models.ensemble_model import EnsemblePredictor
             ensemble_model = EnsemblePredictor()
             default_model_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "models", "karnataka_trained")
             default_model_dir = os.path.abspath(default_model_dir)
@@ -130,18 +146,36 @@ def get_model_instance():
                 logger.info(f"Loaded trained models from {default_model_dir}")
             else:
                 logger.warning("No trained models found; using mock prediction.")
-        
-        model_loaded = True
     except Exception as e:
         logger.warning(f"Model load failed, falling back to mock: {e}")
+        from src.models.ensemble_model import EnsemblePredictor
         ensemble_model = EnsemblePredictor()  # Use original model in mock mode
-        model_loaded = True
     
     return ensemble_model
 
 
-async def get_ensemble_model():
-    """Dependency to get the ensemble model."""
+async def _cached_predict(model, input_data: Dict[str, Any], include_explanation: bool):
+    """Run model.predict, reusing the result for identical inputs within the cache TTL.
+    
+    Callers get their own copy, so mutating a result never touches the cached entry.
+    """
+    if _prediction_cache is None:
+        return await model.predict(input_data, include_explanation=include_explanation)
+    
+    payload = json.dumps([input_data, include_explanation], sort_keys=True, default=str)
+    key = hashlib.blake2b(payload.encode()).digest()
+    result = _prediction_cache.get(key)
+    if result is None:
+        result = await model.predict(input_data, include_explanation=include_explanation)
+        _prediction_cache[key] = copy.deepcopy(result)
+        return result
+    return copy.deepcopy(result)
+
+
+async def get_ensemble_model(request: Request = None):
+    """Dependency to get the ensemble model, preferring one pre-warmed on app.state."""
+    if request is not None and hasattr(request.app.state, 'model'):
+        return request.app.state.model
     return get_model_instance()
 
 
@@ -158,7 +192,7 @@ async def predict_outage(
     """
     try:
         # Track the request for monitoring
-        background_tasks.add_task(track_prediction_request, request)
+        track_prediction_request(request)
         
         # Generate cache key
         cache_key = f"prediction:{hash(str(request.dict()))}"
@@ -277,7 +311,7 @@ async def predict_batch_outages(
                 ))
         
         # Track batch request
-        background_tasks.add_task(track_prediction_request, {"batch_size": len(requests)})
+        track_prediction_request({"batch_size": len(requests)})
         
         logger.info(f"Batch prediction completed: {len(results)} results")
         return results
@@ -361,7 +395,6 @@ async def predict_outage_live(
 
         # Fetch live weather
         from src.weather.karnataka_weather_api import KarnatakaWeatherAPI
-        from config.settings import settings
         weather_api = KarnatakaWeatherAPI(
             openweather_api_key=settings.openweather_api_key,
             weatherapi_key=settings.weatherapi_key if hasattr(settings, 'weatherapi_key') else None
@@ -396,10 +429,7 @@ async def predict_outage_live(
             'prediction_horizon': 24
         }
 
-        prediction_result = await model.predict(
-            input_data,
-            include_explanation=request.include_explanation
-        )
+        prediction_result = await _cached_predict(model, input_data, request.include_explanation)
 
         risk_level = _determine_risk_level(prediction_result['risk_score'])
 
@@ -111,6 +111,18 @@ class LSTMWeatherModel:
         
         embeddings = self.model.predict(weather_reshaped)
         return embeddings.flatten()
+    
+    def predict_embeddings_batch(self, weather_sequences: np.ndarray) -> np.ndarray:
+        """Generate embeddings for a stack of weather sequences in one forward pass."""
+        if self.model is None:
+            raise ValueError("Model not trained yet")
+        
+        n = len(weather_sequences)
+        weather_scaled = self.scaler.transform(weather_sequences.reshape(-1, self.feature_count))
+        weather_reshaped = weather_scaled.reshape(n, self.sequence_length, self.feature_count)
+        
+        embeddings = self.model.predict(weather_reshaped)
+        return embeddings.reshape(n, -1)
 
 
 class XGBoostEnsembleModel:
@@ -207,48 +219,51 @@ class XGBoostEnsembleModel:
     
     def predict_with_explanation(self, features: np.ndarray) -> Dict[str, Any]:
         """Make prediction with SHAP explanation."""
+        return self.predict_batch_with_explanation(features)[0]
+    
+    def predict_batch_with_explanation(self, features: np.ndarray) -> List[Dict[str, Any]]:
+        """Make predictions with SHAP explanations for every row of features in one pass."""
         if self.model is None:
             raise ValueError("Model not trained yet")
         
         # Scale features
         features_scaled = self.feature_scaler.transform(features)
         
-        # Make prediction
-        risk_score = self.model.predict(features_scaled)[0]
+        # Make predictions
+        risk_scores = self.model.predict(features_scaled)
         
-        # Calculate SHAP values
-        shap_values = None
-        feature_attribution = {}
+        # Calculate SHAP values for all rows at once
+        feature_attributions = [{} for _ in range(len(risk_scores))]
         
         if self.explainer is not None:
             try:
                 shap_values = self.explainer(features_scaled)
-                feature_attribution = dict(zip(
-                    self.feature_names, 
-                    shap_values.values[0]
-                ))
+                feature_attributions = [
+                    dict(zip(self.feature_names, row)) for row in shap_values.values
+                ]
             except Exception as e:
                 logger.warning(f"SHAP explanation failed: {str(e)}")
         
-        # Calculate confidence interval (simplified)
-        uncertainty = np.std([
-            self.model.predict(features_scaled + np.random.normal(0, 0.1, features_scaled.shape))[0]
+        # Calculate confidence intervals (simplified)
+        uncertainties = np.std([
+            self.model.predict(features_scaled + np.random.normal(0, 0.1, features_scaled.shape))
             for _ in range(10)
-        ])
-        
-        confidence_interval = {
-            'lower': max(0, risk_score - 1.96 * uncertainty),
-            'upper': min(100, risk_score + 1.96 * uncertainty)
-        }
-        
-        return {
-            'risk_score': float(risk_score),
-            'confidence_interval': confidence_interval,
-            'explanation': {
-                'shap_values': feature_attribution,
-                'feature_importance': dict(zip(self.feature_names, self.model.feature_importances_))
-            }
-        }
+        ], axis=0)
+        
+        results = []
+        for risk_score, uncertainty, feature_attribution in zip(risk_scores, uncertainties, feature_attributions):
+            results.append({
+                'risk_score': float(risk_score),
+                'confidence_interval': {
+                    'lower': max(0, risk_score - 1.96 * uncertainty),
+                    'upper': min(100, risk_score + 1.96 * uncertainty)
+                },
+                'explanation': {
+                    'shap_values': feature_attribution,
+                    'feature_importance': dict(zip(self.feature_names, self.model.feature_importances_))
+                }
+            })
+        return results
 
 
 class EnsemblePredictor:
@@ -289,74 +304,119 @@ class EnsemblePredictor:
     
     async def predict(self, input_data: Dict[str, Any], include_explanation: bool = True) -> Dict[str, Any]:
         """Make outage risk prediction."""
-        try:
-            if not self.is_trained:
-                # In production, load pre-trained models
-                logger.warning("Using mock prediction - model not trained")
-                return self._mock_prediction(input_data, include_explanation)
-            
-            # Extract weather sequence
-            weather_data = input_data['weather']
-            weather_sequence = self._prepare_weather_sequence(weather_data)
-            
-            # Generate weather embeddings
-            weather_embeddings = self.lstm_model.predict_embeddings(weather_sequence)
-            
-            # Engineer temporal features
-            temporal_features = self.feature_engineer.extract_temporal_features(
-                datetime.utcnow()
-            )
-            
-            # Prepare combined features
-            combined_features = self.xgboost_model.prepare_features(
-                weather_embeddings,
-                input_data['grid'],
-                temporal_features
-            )
-            
-            # Make final prediction
-            if include_explanation:
-                result = self.xgboost_model.predict_with_explanation(combined_features)
-            else:
-                features_scaled = self.xgboost_model.feature_scaler.transform(combined_features)
-                risk_score = self.xgboost_model.model.predict(features_scaled)[0]
-                result = {
+        return (await self.predict_batch([input_data], include_explanation))[0]
+    
+    async def predict_batch(self, inputs: List[Dict[str, Any]], include_explanation: bool = True) -> List[Dict[str, Any]]:
+        """Make outage risk predictions for several inputs with one model pass per stage.
+        
+        A malformed input gets the safe default result on its own; the rest of the
+        batch is still scored.
+        """
+        if not inputs:
+            return []
+        
+        if not self.is_trained:
+            # In production, load pre-trained models
+            logger.warning("Using mock prediction - model not trained")
+            return [self._mock_or_failed(i, input_data, include_explanation) for i, input_data in enumerate(inputs)]
+        
+        results = [None] * len(inputs)
+        
+        # Extract weather sequences, setting aside inputs that cannot be read
+        valid, weather_sequences = [], []
+        for i, input_data in enumerate(inputs):
+            try:
+                if not isinstance(input_data['grid'], dict):
+                    raise TypeError("'grid' must be a dict")
+                weather_sequences.append(self._prepare_weather_sequence(input_data['weather']))
+            except (KeyError, TypeError, AttributeError, ValueError) as e:
+                logger.error(f"Prediction error: invalid input {i}: {str(e)}")
+                results[i] = self._failed_prediction()
+                continue
+            valid.append(i)
+        
+        if valid:
+            try:
+                scored = self._predict_valid([inputs[i] for i in valid], np.stack(weather_sequences), include_explanation)
+            except Exception as e:
+                logger.error(f"Prediction error: {str(e)}")
+                scored = [self._failed_prediction() for _ in valid]
+            for i, result in zip(valid, scored):
+                results[i] = result
+        
+        return results
+    
+    def _predict_valid(self, inputs: List[Dict[str, Any]], weather_sequences: np.ndarray,
+                       include_explanation: bool) -> List[Dict[str, Any]]:
+        """Score inputs whose weather and grid data were already read successfully."""
+        # Generate weather embeddings in one LSTM call
+        weather_embeddings = self.lstm_model.predict_embeddings_batch(weather_sequences)
+        
+        # Engineer temporal features
+        temporal_features = self.feature_engineer.extract_temporal_features(
+            datetime.utcnow()
+        )
+        
+        # Prepare combined features, one row per input
+        combined_features = np.vstack([
+            self.xgboost_model.prepare_features(embedding, d['grid'], temporal_features)
+            for embedding, d in zip(weather_embeddings, inputs)
+        ])
+        
+        # Make final predictions
+        if include_explanation:
+            results = self.xgboost_model.predict_batch_with_explanation(combined_features)
+        else:
+            features_scaled = self.xgboost_model.feature_scaler.transform(combined_features)
+            risk_scores = self.xgboost_model.model.predict(features_scaled)
+            results = [
+                {
                     'risk_score': float(risk_score),
                     'confidence_interval': {'lower': max(0, risk_score-10), 'upper': min(100, risk_score+10)}
                 }
-            
-            # Add contributing factors
+                for risk_score in risk_scores
+            ]
+        
+        # Add contributing factors
+        for input_data, result in zip(inputs, results):
             result['contributing_factors'] = self._identify_contributing_factors(
                 input_data, result.get('explanation', {})
             )
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Prediction error: {str(e)}")
-            # Return safe default
-            return {
-                'risk_score': 0.0,
-                'confidence_interval': {'lower': 0.0, 'upper': 0.0},
-                'contributing_factors': ["Prediction failed"]
-            }
+        
+        return results
+    
+    def _mock_or_failed(self, i: int, input_data: Dict[str, Any], include_explanation: bool) -> Dict[str, Any]:
+        """Mock prediction for one input, or the safe default if the input cannot be read."""
+        try:
+            return self._mock_prediction(input_data, include_explanation)
+        except (KeyError, TypeError, AttributeError, ValueError) as e:
+            logger.error(f"Prediction error: invalid input {i}: {str(e)}")
+            return self._failed_prediction()
+    
+    @staticmethod
+    def _failed_prediction() -> Dict[str, Any]:
+        """Safe default returned when a prediction cannot be made."""
+        return {
+            'risk_score': 0.0,
+            'confidence_interval': {'lower': 0.0, 'upper': 0.0},
+            'contributing_factors': ["Prediction failed"]
+        }
     
     def _prepare_weather_sequence(self, weather_data: Dict[str, Any]) -> np.ndarray:
         """Prepare weather data sequence for LSTM."""
         # In production, this would fetch historical weather data
-        # For now, create a mock sequence
-        sequence = []
-        for i in range(24):  # 24-hour sequence
-            sequence.append([
-                weather_data.get('temperature', 25),
-                weather_data.get('humidity', 60),
-                weather_data.get('wind_speed', 10),
-                weather_data.get('rainfall', 0),
-                weather_data.get('lightning_strikes', 0),
-                1 if weather_data.get('storm_alert', False) else 0
-            ])
-        
-        return np.array(sequence)
+        # For now, create a mock sequence repeating the current hour
+        sequence = np.empty((24, 6), dtype=np.float32)  # 24-hour sequence
+        sequence[:] = (
+            weather_data.get('temperature', 25),
+            weather_data.get('humidity', 60),
+            weather_data.get('wind_speed', 10),
+            weather_data.get('rainfall', 0),
+            weather_data.get('lightning_strikes', 0),
+            1 if weather_data.get('storm_alert', False) else 0
+        )
+        
+        return sequence
     
     def _identify_contributing_factors(self, input_data: Dict[str, Any], explanation: Dict[str, Any]) -> List[str]:
         """Identify main contributing factors to risk."""
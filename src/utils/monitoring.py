@@ -1,10 +1,15 @@
-from prometheus_client import Counter, Histogram, Gauge, generate_latest
-from typing import Dict, Any
+from prometheus_client import Counter, Histogram, Gauge, REGISTRY, generate_latest
+from typing import Any, Dict, Tuple
+import bisect
+import itertools
 import time
 import asyncio
 import logging
+from collections import deque
 from datetime import datetime
 
+from config.settings import settings
+
 logger = logging.getLogger(__name__)
 
 # Prometheus metrics
@@ -17,39 +22,79 @@ cache_misses = Counter('cache_misses_total', 'Total cache misses')
 active_connections = Gauge('active_db_connections', 'Active database connections')
 model_inference_time = Histogram('model_inference_seconds', 'Model inference time')
 
+# Risk level buckets: scores below 30 are low, 30-60 medium, 60-80 high, 80+ critical
+RISK_BOUNDS = (30, 60, 80)
+RISK_LABELS = ('low', 'medium', 'high', 'critical')
+
+# Cached labeled children, so repeated label combinations skip the
+# prometheus_client label lookup. Capped to avoid unbounded growth.
+_MAX_LABEL_CHILDREN = 4096
+_req_children: Dict[tuple, Any] = {}
+_duration_children: Dict[str, Any] = {}
+_prediction_children: Dict[tuple, Any] = {}
+
+
+def _get_child(cache: Dict, key, metric, **labels):
+    """Return the cached labeled child for key, creating it on first use."""
+    child = cache.get(key)
+    if child is None:
+        child = metric.labels(**labels)
+        if len(cache) < _MAX_LABEL_CHILDREN:
+            cache[key] = child
+    return child
+
+
+def register_model_versions(model_versions):
+    """Pre-create prediction counter children for every risk level of each model version."""
+    for model_version in model_versions:
+        for risk_level in RISK_LABELS:
+            _get_child(_prediction_children, (model_version, risk_level), prediction_count,
+                       model_version=model_version, risk_level=risk_level)
+
+
+# Known model versions; the fallback label is included so untagged requests
+# also hit a pre-created child
+register_model_versions(('1.0.0', 'unknown'))
+
+
+_TS_CACHE = [0, ""]
+
+
+def _now_iso() -> str:
+    """Current UTC time as ISO string, formatted at most once per second."""
+    now = int(time.time())
+    if now != _TS_CACHE[0]:
+        _TS_CACHE[1] = datetime.utcfromtimestamp(now).isoformat()
+        _TS_CACHE[0] = now
+    return _TS_CACHE[1]
+
 
-async def track_api_request(endpoint: str, method: str, status_code: int, duration: float):
+def track_api_request(endpoint: str, method: str, status_code: int, duration: float):
     """Track API request metrics."""
     try:
-        request_count.labels(endpoint=endpoint, method=method, status=str(status_code)).inc()
-        request_duration.labels(endpoint=endpoint).observe(duration)
+        _get_child(_req_children, (endpoint, method, status_code), request_count,
+                   endpoint=endpoint, method=method, status=str(status_code)).inc()
+        _get_child(_duration_children, endpoint, request_duration,
+                   endpoint=endpoint).observe(duration)
     except Exception as e:
         logger.error(f"Error tracking API request metrics: {str(e)}")
 
 
-async def track_prediction_request(request_data: Dict[str, Any]):
+def track_prediction_request(request_data: Dict[str, Any]):
     """Track prediction request metrics."""
     try:
         model_version = request_data.get('model_version', 'unknown')
         risk_score = request_data.get('risk_score', 0)
+        risk_level = RISK_LABELS[bisect.bisect_right(RISK_BOUNDS, risk_score)]
         
-        # Determine risk level
-        if risk_score >= 80:
-            risk_level = 'critical'
-        elif risk_score >= 60:
-            risk_level = 'high'
-        elif risk_score >= 30:
-            risk_level = 'medium'
-        else:
-            risk_level = 'low'
-        
-        prediction_count.labels(model_version=model_version, risk_level=risk_level).inc()
+        _get_child(_prediction_children, (model_version, risk_level), prediction_count,
+                   model_version=model_version, risk_level=risk_level).inc()
         
     except Exception as e:
         logger.error(f"Error tracking prediction metrics: {str(e)}")
 
 
-async def track_model_inference(inference_time: float):
+def track_model_inference(inference_time: float):
     """Track model inference time."""
     try:
         model_inference_time.observe(inference_time)
@@ -57,17 +102,69 @@ async def track_model_inference(inference_time: float):
         logger.error(f"Error tracking inference time: {str(e)}")
 
 
-async def track_cache_operation(operation: str):
+# Cache hits/misses are tallied locally and flushed to Prometheus in batches
+_CACHE_FLUSH_OPS = 1000
+_CACHE_FLUSH_SECONDS = 0.25
+_cache_hit_batch = 0
+_cache_miss_batch = 0
+_cache_last_flush = time.monotonic()
+
+
+def flush_cache_metrics():
+    """Push pending cache hit/miss tallies to the Prometheus counters."""
+    global _cache_hit_batch, _cache_miss_batch, _cache_last_flush
+    hits, misses = _cache_hit_batch, _cache_miss_batch
+    _cache_hit_batch = _cache_miss_batch = 0
+    _cache_last_flush = time.monotonic()
+    if hits:
+        cache_hits.inc(hits)
+    if misses:
+        cache_misses.inc(misses)
+
+
+def track_cache_operation(operation: str):
     """Track cache hit/miss."""
+    global _cache_hit_batch, _cache_miss_batch
+    if not settings.metrics_enabled:
+        return
     try:
         if operation == 'hit':
-            cache_hits.inc()
+            _cache_hit_batch += 1
         elif operation == 'miss':
-            cache_misses.inc()
+            _cache_miss_batch += 1
+        else:
+            return
+        
+        if (_cache_hit_batch + _cache_miss_batch >= _CACHE_FLUSH_OPS or
+                time.monotonic() - _cache_last_flush >= _CACHE_FLUSH_SECONDS):
+            flush_cache_metrics()
     except Exception as e:
         logger.error(f"Error tracking cache metrics: {str(e)}")
 
 
+class _SingleMetricRegistry:
+    """Registry shim exposing a single collected metric family to generate_latest."""
+    
+    def __init__(self, metric):
+        self.metric = metric
+    
+    def collect(self):
+        yield self.metric
+
+
+def _iter_metric_chunks():
+    """Yield each registered metric family in Prometheus text format."""
+    flush_cache_metrics()
+    for metric in REGISTRY.collect():
+        yield generate_latest(_SingleMetricRegistry(metric))
+
+
+async def stream_metrics():
+    """Stream metrics one family at a time instead of buffering the full payload."""
+    for chunk in _iter_metric_chunks():
+        yield chunk
+
+
 def get_metrics():
     """Get all metrics in Prometheus format."""
     return generate_latest()
@@ -83,54 +180,102 @@ class PerformanceMonitor:
             'memory_usage_percent': 80.0,
             'cpu_usage_percent': 70.0
         }
-        self.alerts = []
+        self.alerts = deque(maxlen=10000)
+        self._active_alerts: Dict[str, Dict[str, Any]] = {}
+        self._alert_seq = itertools.count(1)
+        self._cached_checks = None
+        self._refresh_task = None
+    
+    async def start(self, interval: float = 5.0):
+        """Start the background health check refresher."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._health_refresh_loop(interval))
+    
+    async def stop(self):
+        """Stop the background health check refresher."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+    
+    async def _health_refresh_loop(self, interval: float):
+        """Periodically refresh the cached health checks."""
+        while True:
+            try:
+                self._cached_checks = await self._collect_checks()
+            except Exception as e:
+                logger.error(f"Health refresh error: {str(e)}")
+            await asyncio.sleep(interval)
+    
+    async def _collect_checks(self) -> Tuple[Dict[str, Any], int]:
+        """Run the individual health checks, returning them with their warning count."""
+        checks = {}
+        warnings = 0
+        
+        avg_response_time, error_rate, model_accuracy = await asyncio.gather(
+            self._get_average_response_time(),
+            self._get_error_rate(),
+            self._get_model_accuracy()
+        )
+        
+        # Check API response time
+        checks['api_response_time'] = {
+            'value': avg_response_time,
+            'status': 'healthy' if avg_response_time < self.alert_thresholds['response_time_ms'] else 'warning',
+            'threshold': self.alert_thresholds['response_time_ms']
+        }
+        warnings += checks['api_response_time']['status'] == 'warning'
+        
+        # Check error rate
+        checks['error_rate'] = {
+            'value': error_rate,
+            'status': 'healthy' if error_rate < self.alert_thresholds['error_rate_percent'] else 'warning',
+            'threshold': self.alert_thresholds['error_rate_percent']
+        }
+        warnings += checks['error_rate']['status'] == 'warning'
+        
+        # Check model performance
+        checks['model_accuracy'] = {
+            'value': model_accuracy,
+            'status': 'healthy' if model_accuracy > 0.7 else 'warning',
+            'threshold': 0.7
+        }
+        warnings += checks['model_accuracy']['status'] == 'warning'
+        
+        return checks, warnings
     
     async def check_system_health(self) -> Dict[str, Any]:
-        """Check overall system health."""
+        """Check overall system health.
+        
+        Serves the checks cached by the background refresher, collecting
+        them inline only when the refresher has not produced any yet.
+        """
         try:
+            cached = self._cached_checks
+            if cached is None:
+                cached = await self._collect_checks()
+            checks, warnings = cached
+            
             health_status = {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': _now_iso(),
                 'status': 'healthy',
-                'checks': {}
-            }
-            
-            # Check API response time
-            avg_response_time = await self._get_average_response_time()
-            health_status['checks']['api_response_time'] = {
-                'value': avg_response_time,
-                'status': 'healthy' if avg_response_time < self.alert_thresholds['response_time_ms'] else 'warning',
-                'threshold': self.alert_thresholds['response_time_ms']
-            }
-            
-            # Check error rate
-            error_rate = await self._get_error_rate()
-            health_status['checks']['error_rate'] = {
-                'value': error_rate,
-                'status': 'healthy' if error_rate < self.alert_thresholds['error_rate_percent'] else 'warning',
-                'threshold': self.alert_thresholds['error_rate_percent']
-            }
-            
-            # Check model performance
-            model_accuracy = await self._get_model_accuracy()
-            health_status['checks']['model_accuracy'] = {
-                'value': model_accuracy,
-                'status': 'healthy' if model_accuracy > 0.7 else 'warning',
-                'threshold': 0.7
+                'checks': dict(checks)
             }
             
             # Determine overall status
-            warning_checks = [check for check in health_status['checks'].values() 
-                            if check['status'] == 'warning']
-            if warning_checks:
+            if warnings:
                 health_status['status'] = 'warning'
-                health_status['warnings'] = len(warning_checks)
+                health_status['warnings'] = warnings
             
             return health_status
             
         except Exception as e:
             logger.error(f"Health check error: {str(e)}")
             return {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': _now_iso(),
                 'status': 'error',
                 'error': str(e)
             }
@@ -157,15 +302,16 @@ class PerformanceMonitor:
         """Generate system alert."""
         try:
             alert = {
-                'id': f"alert_{int(time.time())}",
+                'id': f"alert_{int(time.time())}_{next(self._alert_seq)}",
                 'type': alert_type,
                 'message': message,
                 'severity': severity,
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': _now_iso(),
                 'acknowledged': False
             }
             
             self.alerts.append(alert)
+            self._active_alerts[alert['id']] = alert
             logger.warning(f"Generated alert: {alert_type} - {message}")
             
             # In production, this would send notifications
@@ -178,17 +324,17 @@ class PerformanceMonitor:
     
     async def get_active_alerts(self) -> list:
         """Get active (unacknowledged) alerts."""
-        return [alert for alert in self.alerts if not alert['acknowledged']]
+        return list(self._active_alerts.values())
     
     async def acknowledge_alert(self, alert_id: str) -> bool:
         """Acknowledge an alert."""
         try:
-            for alert in self.alerts:
-                if alert['id'] == alert_id:
-                    alert['acknowledged'] = True
-                    alert['acknowledged_at'] = datetime.utcnow().isoformat()
-                    return True
-            return False
+            alert = self._active_alerts.pop(alert_id, None)
+            if alert is None:
+                return False
+            alert['acknowledged'] = True
+            alert['acknowledged_at'] = _now_iso()
+            return True
         except Exception as e:
             logger.error(f"Error acknowledging alert: {str(e)}")
             return False
@@ -207,14 +353,24 @@ class MetricsCollector:
     async def collect_business_metrics(self) -> Dict[str, Any]:
         """Collect business-specific metrics."""
         try:
+            (last_hour, last_day, high_risk, average_risk,
+             top_regions, model_performance) = await asyncio.gather(
+                self._count_recent_predictions(hours=1),
+                self._count_recent_predictions(hours=24),
+                self._count_high_risk_predictions(),
+                self._get_average_risk_score(),
+                self._get_top_affected_regions(),
+                self._get_model_performance_summary()
+            )
+            
             metrics = {
-                'timestamp': datetime.utcnow().isoformat(),
-                'predictions_last_hour': await self._count_recent_predictions(hours=1),
-                'predictions_last_day': await self._count_recent_predictions(hours=24),
-                'high_risk_predictions': await self._count_high_risk_predictions(),
-                'average_risk_score': await self._get_average_risk_score(),
-                'top_affected_regions': await self._get_top_affected_regions(),
-                'model_performance': await self._get_model_performance_summary()
+                'timestamp': _now_iso(),
+                'predictions_last_hour': last_hour,
+                'predictions_last_day': last_day,
+                'high_risk_predictions': high_risk,
+                'average_risk_score': average_risk,
+                'top_affected_regions': top_regions,
+                'model_performance': model_performance
             }
             
             return metrics
@@ -260,7 +416,7 @@ class MetricsCollector:
             'precision': 0.82,
             'recall': 0.78,
             'f1_score': 0.80,
-            'last_updated': datetime.utcnow().isoformat()
+            'last_updated': _now_iso()
         }
 
 
@@ -1,17 +1,69 @@
 from typing import Dict, List, Any, Optional
+import bisect
 import logging
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
 import numpy as np
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from src.api.models import WhatIfRequest, PredictionRequest
 from src.utils.feature_engineering import FeatureEngineer
+from src.utils.monitoring import RISK_BOUNDS, RISK_LABELS
 
 logger = logging.getLogger(__name__)
 
+_RISK_THRESHOLDS = dict(zip(("low_to_medium", "medium_to_high", "high_to_critical"), RISK_BOUNDS))
+
+# Sweeps at least this long use the JIT crossing detector when numba is installed
+_NUMBA_MIN_POINTS = 512
+
+
+def _find_crossings_py(rs: np.ndarray, threshold: float) -> np.ndarray:
+    """Indices i where risk moves across threshold between points i-1 and i."""
+    prev_r, cur_r = rs[:-1], rs[1:]
+    crossed = (((prev_r < threshold) & (cur_r >= threshold)) |
+               ((prev_r > threshold) & (cur_r <= threshold)))
+    return np.flatnonzero(crossed) + 1
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _find_crossings_jit(rs, threshold):
+        out_idx = np.empty(rs.size, np.int64)
+        n = 0
+        for i in range(1, rs.size):
+            prev, cur = rs[i - 1], rs[i]
+            if (prev < threshold <= cur) or (prev > threshold >= cur):
+                out_idx[n] = i
+                n += 1
+        return out_idx[:n]
+
+
+@lru_cache(maxsize=256)
+def _compile_path(path: str):
+    """Compile a dotted attribute path into a parent getter and final attribute name."""
+    parent, _, last = path.rpartition('.')
+    getter = attrgetter(parent) if parent else (lambda obj: obj)
+    return getter, last
+
 
 class ScenarioAnalyzer:
     """Analyzes what-if scenarios and parameter sensitivity."""
     
+    # Impact factor per parameter, keyed by the final segment of its path
+    _IMPACT_FNS = {
+        "rainfall": lambda v: min(v / 50.0, 1.0),             # Normalize by 50mm
+        "wind_speed": lambda v: min(v / 100.0, 1.0),          # Normalize by 100 km/h
+        "temperature": lambda v: min(abs(v - 25) / 20.0, 1.0),  # Deviation from 25°C
+        "load_factor": lambda v: v
+    }
+    
     def __init__(self):
         self.feature_engineer = FeatureEngineer()
         
@@ -20,8 +72,11 @@ class ScenarioAnalyzer:
                                 modifications: Dict[str, Any]) -> PredictionRequest:
         """Apply parameter modifications to base scenario."""
         try:
-            # Create a copy of the base scenario
-            modified_scenario = base_scenario.copy(deep=True)
+            # Shallow-copy the base scenario and clone only the sub-models
+            # that will be mutated; untouched branches stay shared
+            modified_scenario = base_scenario.copy()
+            for root in {path.split('.', 1)[0] for path in modifications if '.' in path}:
+                setattr(modified_scenario, root, getattr(base_scenario, root).copy(deep=True))
             
             # Apply modifications
             for param_path, new_value in modifications.items():
@@ -67,19 +122,18 @@ class ScenarioAnalyzer:
             if not results:
                 return {"error": "No results to analyze"}
             
-            risk_changes = [r.risk_change for r in results]
-            baseline_risks = [r.base_prediction.risk_score for r in results]
-            modified_risks = [r.modified_prediction.risk_score for r in results]
+            n = len(results)
+            risk_changes = np.fromiter((r.risk_change for r in results), dtype=np.float64, count=n)
             
             summary = {
-                "total_simulations": len(results),
-                "average_risk_change": np.mean(risk_changes),
-                "max_risk_change": max(risk_changes),
-                "min_risk_change": min(risk_changes),
-                "risk_change_std": np.std(risk_changes),
-                "scenarios_increasing_risk": len([r for r in risk_changes if r > 0]),
-                "scenarios_decreasing_risk": len([r for r in risk_changes if r < 0]),
-                "most_impactful_scenario": self._find_most_impactful_scenario(results),
+                "total_simulations": n,
+                "average_risk_change": float(risk_changes.mean()),
+                "max_risk_change": float(risk_changes.max()),
+                "min_risk_change": float(risk_changes.min()),
+                "risk_change_std": float(risk_changes.std()),
+                "scenarios_increasing_risk": int(np.count_nonzero(risk_changes > 0)),
+                "scenarios_decreasing_risk": int(np.count_nonzero(risk_changes < 0)),
+                "most_impactful_scenario": self._find_most_impactful_scenario(results, risk_changes),
                 "correlation_analysis": self._analyze_parameter_correlations(results)
             }
             
@@ -102,18 +156,26 @@ class ScenarioAnalyzer:
             risk_range = max(risk_scores) - min(risk_scores)
             sensitivity = risk_range / param_range if param_range > 0 else 0
             
-            # Calculate correlation
-            correlation = np.corrcoef(parameter_values, risk_scores)[0, 1] if len(parameter_values) > 1 else 0
+            # Calculate Pearson correlation directly from centered dot products
+            correlation = 0.0
+            if len(parameter_values) > 1:
+                dx = np.asarray(parameter_values, dtype=np.float64)
+                dy = np.asarray(risk_scores, dtype=np.float64)
+                dx = dx - dx.mean()
+                dy = dy - dy.mean()
+                denom = np.sqrt(dx @ dx) * np.sqrt(dy @ dy)
+                if denom:
+                    correlation = float(dx @ dy / denom)
             
-            # Find threshold values
-            threshold_analysis = self._find_risk_thresholds(parameter_values, risk_scores)
+            # Gradient, elasticity and threshold crossings share one vectorized pass
+            sweep = self._calculate_sweep_metrics(parameter_values, risk_scores)
             
             metrics = {
                 "sensitivity_coefficient": sensitivity,
                 "correlation": correlation,
-                "parameter_elasticity": self._calculate_elasticity(parameter_values, risk_scores),
-                "threshold_analysis": threshold_analysis,
-                "risk_gradient": self._calculate_risk_gradient(parameter_values, risk_scores),
+                "parameter_elasticity": sweep["parameter_elasticity"],
+                "threshold_analysis": sweep["threshold_analysis"],
+                "risk_gradient": sweep["risk_gradient"],
                 "optimal_range": self._find_optimal_parameter_range(parameter_values, risk_scores)
             }
             
@@ -125,16 +187,13 @@ class ScenarioAnalyzer:
     
     def _set_nested_value(self, obj: Any, path: str, value: Any):
         """Set nested attribute value using dot notation."""
-        parts = path.split('.')
-        current = obj
-        
-        for part in parts[:-1]:
-            if hasattr(current, part):
-                current = getattr(current, part)
-            else:
-                raise ValueError(f"Invalid parameter path: {path}")
+        getter, last = _compile_path(path)
+        try:
+            parent = getter(obj)
+        except AttributeError:
+            raise ValueError(f"Invalid parameter path: {path}")
         
-        setattr(current, parts[-1], value)
+        setattr(parent, last, value)
     
     def _categorize_change_magnitude(self, change: float) -> str:
         """Categorize the magnitude of risk change."""
@@ -155,16 +214,13 @@ class ScenarioAnalyzer:
         
         for param, value in modifications.items():
             # Estimate individual parameter contribution
-            if "rainfall" in param.lower():
-                impact_factor = min(float(value) / 50.0, 1.0)  # Normalize by 50mm
-            elif "wind_speed" in param.lower():
-                impact_factor = min(float(value) / 100.0, 1.0)  # Normalize by 100 km/h
-            elif "temperature" in param.lower():
-                impact_factor = min(abs(float(value) - 25) / 20.0, 1.0)  # Deviation from 25°C
-            elif "load_factor" in param.lower():
-                impact_factor = float(value)
-            else:
-                impact_factor = 0.5  # Default for unknown parameters
+            impact_fn = self._IMPACT_FNS.get(param.rpartition('.')[2])
+            if impact_fn is None:
+                param_lower = param.lower()
+                impact_fn = next((fn for token, fn in self._IMPACT_FNS.items() if token in param_lower), None)
+            
+            # Default for unknown parameters
+            impact_factor = impact_fn(float(value)) if impact_fn is not None else 0.5
             
             estimated_contribution = total_change * impact_factor * 0.7  # Conservative estimate
             
@@ -197,18 +253,8 @@ class ScenarioAnalyzer:
                                  baseline: Dict[str, Any], 
                                  modified: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze risk level category changes."""
-        def get_risk_level(score):
-            if score >= 80:
-                return "critical"
-            elif score >= 60:
-                return "high"
-            elif score >= 30:
-                return "medium"
-            else:
-                return "low"
-        
-        baseline_level = get_risk_level(baseline['risk_score'])
-        modified_level = get_risk_level(modified['risk_score'])
+        baseline_level = RISK_LABELS[bisect.bisect_right(RISK_BOUNDS, baseline['risk_score'])]
+        modified_level = RISK_LABELS[bisect.bisect_right(RISK_BOUNDS, modified['risk_score'])]
         
         return {
             "baseline_level": baseline_level,
@@ -250,12 +296,16 @@ class ScenarioAnalyzer:
         
         return interpretation
     
-    def _find_most_impactful_scenario(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _find_most_impactful_scenario(self, 
+                                    results: List[Dict[str, Any]],
+                                    risk_changes: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Find the scenario with the highest impact."""
         if not results:
             return {}
         
-        max_impact_scenario = max(results, key=lambda x: abs(x.risk_change))
+        if risk_changes is None:
+            risk_changes = np.fromiter((r.risk_change for r in results), dtype=np.float64, count=len(results))
+        max_impact_scenario = results[int(np.argmax(np.abs(risk_changes)))]
         
         return {
             "scenario_name": max_impact_scenario.scenario_name,
@@ -273,68 +323,58 @@ class ScenarioAnalyzer:
             "analysis_note": "Detailed correlation analysis requires more data points"
         }
     
-    def _find_risk_thresholds(self, 
-                            parameter_values: List[float], 
-                            risk_scores: List[float]) -> Dict[str, Any]:
-        """Find parameter values that cross risk thresholds."""
-        thresholds = {"low_to_medium": 30, "medium_to_high": 60, "high_to_critical": 80}
-        threshold_crossings = {}
+    def _calculate_sweep_metrics(self, 
+                               parameter_values: List[float], 
+                               risk_scores: List[float]) -> Dict[str, Any]:
+        """Calculate risk gradient, elasticity and threshold crossings in one pass."""
+        pv = np.asarray(parameter_values, dtype=np.float64)
+        rs = np.asarray(risk_scores, dtype=np.float64)
         
-        for threshold_name, threshold_value in thresholds.items():
-            crossings = []
-            for i, risk in enumerate(risk_scores):
-                if i > 0:
-                    prev_risk = risk_scores[i-1]
-                    if (prev_risk < threshold_value <= risk) or (prev_risk > threshold_value >= risk):
-                        crossings.append({
-                            "parameter_value": parameter_values[i],
-                            "risk_score": risk,
-                            "crossing_direction": "up" if risk > prev_risk else "down"
-                        })
-            
-            threshold_crossings[threshold_name] = crossings
+        if pv.size < 2:
+            return {
+                "risk_gradient": [],
+                "parameter_elasticity": 0.0,
+                "threshold_analysis": {name: [] for name in _RISK_THRESHOLDS}
+            }
         
-        return threshold_crossings
-    
-    def _calculate_elasticity(self, 
-                            parameter_values: List[float], 
-                            risk_scores: List[float]) -> float:
-        """Calculate parameter elasticity of risk."""
-        if len(parameter_values) < 2:
-            return 0.0
+        prev_p, prev_r = pv[:-1], rs[:-1]
+        dp = np.diff(pv)
+        dr = np.diff(rs)
         
-        # Calculate percentage changes
-        param_changes = []
-        risk_changes = []
+        # Risk gradient (rate of change), zero where the parameter does not move
+        gradient = np.divide(dr, dp, out=np.zeros_like(dr), where=dp != 0)
         
-        for i in range(1, len(parameter_values)):
-            if parameter_values[i-1] != 0 and risk_scores[i-1] != 0:
-                param_pct_change = (parameter_values[i] - parameter_values[i-1]) / parameter_values[i-1]
-                risk_pct_change = (risk_scores[i] - risk_scores[i-1]) / risk_scores[i-1]
-                
-                if param_pct_change != 0:
-                    elasticity = risk_pct_change / param_pct_change
-                    param_changes.append(param_pct_change)
-                    risk_changes.append(elasticity)
+        # Elasticity: mean ratio of percentage changes over valid steps
+        valid = (prev_p != 0) & (prev_r != 0) & (dp != 0)
+        if valid.any():
+            pct_p = dp[valid] / prev_p[valid]
+            pct_r = dr[valid] / prev_r[valid]
+            elasticity = float((pct_r / pct_p).mean())
+        else:
+            elasticity = 0.0
         
-        return np.mean(risk_changes) if risk_changes else 0.0
-    
-    def _calculate_risk_gradient(self, 
-                               parameter_values: List[float], 
-                               risk_scores: List[float]) -> List[float]:
-        """Calculate risk gradient (rate of change)."""
-        if len(parameter_values) < 2:
-            return []
+        # Threshold crossings between consecutive points
+        if NUMBA_AVAILABLE and rs.size >= _NUMBA_MIN_POINTS:
+            find_crossings = _find_crossings_jit
+        else:
+            find_crossings = _find_crossings_py
         
-        gradients = []
-        for i in range(1, len(parameter_values)):
-            param_diff = parameter_values[i] - parameter_values[i-1]
-            risk_diff = risk_scores[i] - risk_scores[i-1]
-            
-            gradient = risk_diff / param_diff if param_diff != 0 else 0
-            gradients.append(gradient)
+        threshold_crossings = {}
+        for threshold_name, threshold_value in _RISK_THRESHOLDS.items():
+            threshold_crossings[threshold_name] = [
+                {
+                    "parameter_value": parameter_values[i],
+                    "risk_score": risk_scores[i],
+                    "crossing_direction": "up" if risk_scores[i] > risk_scores[i-1] else "down"
+                }
+                for i in find_crossings(rs, float(threshold_value)).tolist()
+            ]
         
-        return gradients
+        return {
+            "risk_gradient": gradient.tolist(),
+            "parameter_elasticity": elasticity,
+            "threshold_analysis": threshold_crossings
+        }
     
     def _find_optimal_parameter_range(self, 
                                     parameter_values: List[float], 
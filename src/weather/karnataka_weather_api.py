@@ -8,13 +8,68 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 import asyncio
 import aiohttp
-from dataclasses import dataclass
+import orjson
+from cachetools import TTLCache
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, fields
 
 logger = logging.getLogger(__name__)
 
+# Description keywords behind the derived risk fields
+_LIGHTNING_KEYWORDS = ('thunder', 'lightning', 'storm')
+_SEVERE_KEYWORDS = ('severe', 'heavy', 'intense', 'extreme')
+_MONSOON_KEYWORDS = ('rain', 'drizzle', 'shower', 'downpour')
+
+# Keyword group bits packed per record
+_FLAG_LIGHTNING = 1
+_FLAG_SEVERE = 2
+_FLAG_MONSOON = 4
+
+
+def _keyword_flags(descriptions: List[str]) -> np.ndarray:
+    """Pack the keyword groups found in each description into an int8 bitmask."""
+    flags = np.zeros(len(descriptions), dtype=np.int8)
+    for i, description in enumerate(descriptions):
+        description_lower = description.lower()
+        if any(k in description_lower for k in _LIGHTNING_KEYWORDS):
+            flags[i] |= _FLAG_LIGHTNING
+        if any(k in description_lower for k in _SEVERE_KEYWORDS):
+            flags[i] |= _FLAG_SEVERE
+        if any(k in description_lower for k in _MONSOON_KEYWORDS):
+            flags[i] |= _FLAG_MONSOON
+    return flags
+
+
+# OpenWeather request limits: in-flight cap (matches the connector's per-host
+# limit budget) and retries with exponential backoff on throttling
+_MAX_INFLIGHT_REQUESTS = 8
+_MAX_ATTEMPTS = 3
+_RETRY_STATUSES = (429, 503)
+_CURRENT_CACHE_SIZE = 128
+_CURRENT_CACHE_TTL = 600  # OpenWeather refreshes current conditions about every 10 minutes
+_GROUP_MAX_IDS = 20  # OpenWeather /group accepts at most 20 city ids per call
+
+_API_SETUP_INSTRUCTIONS = """
+        🔑 WEATHER API SETUP INSTRUCTIONS:
+        
+        1. OpenWeather API (Primary):
+           - Sign up: https://home.openweathermap.org/users/sign_up
+           - Get free API key (1000 calls/day)
+           - Add to .env file: OPENWEATHER_API_KEY=your_key_here
+        
+        2. WeatherAPI (Backup):
+           - Sign up: https://www.weatherapi.com/signup.aspx
+           - Get free API key (1M calls/month)
+           - Add to .env file: WEATHERAPI_KEY=your_key_here
+        
+        3. Test APIs:
+           - weather_api = KarnatakaWeatherAPI(openweather_key, weatherapi_key)
+           - data = weather_api.get_current_weather_all_cities()
+        """
+
 @dataclass
 class WeatherData:
     """Weather data structure for Karnataka locations."""
@@ -36,6 +91,61 @@ class WeatherData:
     monsoon_intensity: float
 
 
+_WEATHER_FIELDS = tuple(f.name for f in fields(WeatherData))
+
+# Compact storage dtypes for saved weather columns; readings are low precision
+_WEATHER_DTYPES = {
+    'latitude': np.float32,
+    'longitude': np.float32,
+    'temperature': np.float32,
+    'humidity': np.float32,
+    'wind_speed': np.float32,
+    'rainfall': np.float32,
+    'pressure': np.float32,
+    'visibility': np.float32,
+    'lightning_risk': np.int8,
+    'storm_alert': np.int8,
+    'monsoon_intensity': np.float32
+}
+
+
+@dataclass
+class WeatherBatch:
+    """Columnar batch of weather records, one array per WeatherData field."""
+    timestamp: np.ndarray
+    city: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    temperature: np.ndarray
+    humidity: np.ndarray
+    wind_speed: np.ndarray
+    rainfall: np.ndarray
+    pressure: np.ndarray
+    visibility: np.ndarray
+    weather_description: np.ndarray
+    
+    # Derived fields for ML
+    lightning_risk: np.ndarray
+    storm_alert: np.ndarray
+    monsoon_intensity: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.city)
+    
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        """Return the batch as an ordered dict of column arrays."""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+    
+    def row(self, i: int) -> WeatherData:
+        """Materialize a single record."""
+        return WeatherData(*(column[i:i + 1].tolist()[0] for column in self.to_columns().values()))
+    
+    def rows(self) -> List[WeatherData]:
+        """Materialize every record."""
+        columns = [column.tolist() for column in self.to_columns().values()]
+        return [WeatherData(*values) for values in zip(*columns)]
+
+
 class KarnatakaWeatherAPI:
     """Real weather API integration for Karnataka cities."""
     
@@ -59,54 +169,140 @@ class KarnatakaWeatherAPI:
             'tumkur': {'lat': 13.3379, 'lon': 77.1022, 'priority': 2}
         }
         
+        # City coordinates as parallel arrays for batch work
+        self._city_names = tuple(self.karnataka_cities)
+        self._lats = np.fromiter((c['lat'] for c in self.karnataka_cities.values()), dtype=np.float64)
+        self._lons = np.fromiter((c['lon'] for c in self.karnataka_cities.values()), dtype=np.float64)
+        
         # API endpoints
         self.openweather_base = "https://api.openweathermap.org/data/2.5"
         self.weatherapi_base = "https://api.weatherapi.com/v1"
+        self._current_url = f"{self.openweather_base}/weather"
+        self._forecast_url = f"{self.openweather_base}/forecast"
+        self._group_url = f"{self.openweather_base}/group"
+        self._base_params = {'appid': self.openweather_key, 'units': 'metric'}
         
-    def get_api_setup_instructions(self):
-        """Return instructions for setting up weather APIs."""
-        return """
-        🔑 WEATHER API SETUP INSTRUCTIONS:
-        
-        1. OpenWeather API (Primary):
-           - Sign up: https://home.openweathermap.org/users/sign_up
-           - Get free API key (1000 calls/day)
-           - Add to .env file: OPENWEATHER_API_KEY=your_key_here
+        # Shared HTTP session, open while the API is used as an async context
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_refs = 0
+        self._semaphore = asyncio.Semaphore(_MAX_INFLIGHT_REQUESTS)
         
-        2. WeatherAPI (Backup):
-           - Sign up: https://www.weatherapi.com/signup.aspx
-           - Get free API key (1M calls/month)
-           - Add to .env file: WEATHERAPI_KEY=your_key_here
+        # Recent current-weather results, with one lock per location so concurrent misses fetch once
+        self._current_cache = TTLCache(maxsize=_CURRENT_CACHE_SIZE, ttl=_CURRENT_CACHE_TTL)
+        self._current_locks = TTLCache(maxsize=_CURRENT_CACHE_SIZE, ttl=_CURRENT_CACHE_TTL)
+    
+    async def __aenter__(self):
+        """Open a shared keep-alive session reused by all requests in the block."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        self._session_refs += 1
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self._session_refs -= 1
+        if self._session_refs == 0 and self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    @asynccontextmanager
+    async def _session_scope(self):
+        """Yield the shared session, opening one for this call if none is active."""
+        async with self:
+            yield self._session
         
-        3. Test APIs:
-           - weather_api = KarnatakaWeatherAPI(openweather_key, weatherapi_key)
-           - data = weather_api.get_current_weather_all_cities()
-        """
+    def get_api_setup_instructions(self):
+        """Return instructions for setting up weather APIs."""
+        return _API_SETUP_INSTRUCTIONS
+    
+    async def _fetch_openweather(self, url: str, params: dict):
+        """GET an OpenWeather endpoint, returning (status, json payload or None)."""
+        async with self._semaphore:
+            async with self._session_scope() as session:
+                for attempt in range(_MAX_ATTEMPTS):
+                    async with session.get(url, params=params) as response:
+                        if response.status == 200:
+                            return response.status, orjson.loads(await response.read())
+                        if response.status not in _RETRY_STATUSES or attempt == _MAX_ATTEMPTS - 1:
+                            return response.status, None
+                    await asyncio.sleep(2 ** attempt)
     
     async def get_openweather_current(self, city: str, lat: float, lon: float) -> Optional[WeatherData]:
-        """Get current weather from OpenWeather API."""
+        """Get current weather from OpenWeather API, served from cache for up to 10 minutes."""
+        key = (city, lat, lon)
+        cached = self._current_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        lock = self._current_locks.get(key)
+        if lock is None:
+            lock = self._current_locks[key] = asyncio.Lock()
+        async with lock:
+            cached = self._current_cache.get(key)
+            if cached is None:
+                cached = await self._fetch_openweather_current(city, lat, lon)
+                if cached is not None:
+                    self._current_cache[key] = cached
+            return cached
+    
+    async def _fetch_openweather_current(self, city: str, lat: float, lon: float) -> Optional[WeatherData]:
+        """Request current weather for one location from OpenWeather."""
         try:
-            url = f"{self.openweather_base}/weather"
-            params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': self.openweather_key,
-                'units': 'metric'
-            }
+            params = {**self._base_params, 'lat': lat, 'lon': lon}
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._parse_openweather_response(city, lat, lon, data)
-                    else:
-                        logger.error(f"OpenWeather API error for {city}: {response.status}")
-                        return None
+            status, data = await self._fetch_openweather(self._current_url, params)
+            if status == 200:
+                # Remember the OpenWeather city id so later polls can use the group endpoint
+                if city in self.karnataka_cities and 'id' in data:
+                    self.karnataka_cities[city]['id'] = data['id']
+                return self._parse_openweather_response(city, lat, lon, data)
+            else:
+                logger.error(f"OpenWeather API error for {city}: {status}")
+                return None
                         
         except Exception as e:
             logger.error(f"OpenWeather API error for {city}: {str(e)}")
             return None
     
+    async def get_group_current(self) -> Optional[List[WeatherData]]:
+        """Get current weather for all cities through the OpenWeather group endpoint.
+        
+        Returns None when city ids are not known yet or a group call fails, so the
+        caller can fall back to per-city requests.
+        """
+        id_to_city = {
+            info['id']: name for name, info in self.karnataka_cities.items() if 'id' in info
+        }
+        if len(id_to_city) < len(self.karnataka_cities):
+            return None
+        
+        ids = list(id_to_city)
+        chunks = [ids[i:i + _GROUP_MAX_IDS] for i in range(0, len(ids), _GROUP_MAX_IDS)]
+        try:
+            responses = await asyncio.gather(*(
+                self._fetch_openweather(self._group_url, {**self._base_params, 'id': ','.join(map(str, chunk))})
+                for chunk in chunks
+            ))
+        except Exception as e:
+            logger.error(f"OpenWeather group error: {str(e)}")
+            return None
+        
+        weather_data = []
+        for status, data in responses:
+            if status != 200:
+                logger.error(f"OpenWeather group error: {status}")
+                return None
+            for item in data.get('list', []):
+                city = id_to_city.get(item.get('id'))
+                if city is not None:
+                    info = self.karnataka_cities[city]
+                    weather = self._parse_openweather_response(city, info['lat'], info['lon'], item)
+                    self._current_cache[(city, info['lat'], info['lon'])] = weather
+                    weather_data.append(weather)
+        return weather_data
+    
     def _parse_openweather_response(self, city: str, lat: float, lon: float, data: dict) -> WeatherData:
         """Parse OpenWeather API response."""
         main = data.get('main', {})
@@ -124,9 +320,10 @@ class KarnatakaWeatherAPI:
         description = weather.get('description', '')
         
         # Calculate derived fields
-        lightning_risk = self._calculate_lightning_risk(description, wind_speed, humidity)
-        storm_alert = self._calculate_storm_alert(description, wind_speed, rainfall)
-        monsoon_intensity = self._calculate_monsoon_intensity(rainfall, humidity, description)
+        description_lower = description.lower()
+        lightning_risk = self._calculate_lightning_risk(description_lower, wind_speed, humidity)
+        storm_alert = self._calculate_storm_alert(description_lower, wind_speed, rainfall)
+        monsoon_intensity = self._calculate_monsoon_intensity(rainfall, humidity, description_lower)
         
         return WeatherData(
             timestamp=datetime.utcnow(),
@@ -148,23 +345,14 @@ class KarnatakaWeatherAPI:
     async def get_openweather_forecast(self, city: str, lat: float, lon: float, hours: int = 24) -> List[WeatherData]:
         """Get weather forecast from OpenWeather API."""
         try:
-            url = f"{self.openweather_base}/forecast"
-            params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': self.openweather_key,
-                'units': 'metric',
-                'cnt': min(hours, 40)  # API limit
-            }
+            params = {**self._base_params, 'lat': lat, 'lon': lon, 'cnt': min(hours, 40)}  # API limit
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._parse_openweather_forecast(city, lat, lon, data)
-                    else:
-                        logger.error(f"OpenWeather forecast error for {city}: {response.status}")
-                        return []
+            status, data = await self._fetch_openweather(self._forecast_url, params)
+            if status == 200:
+                return self._parse_openweather_forecast(city, lat, lon, data)
+            else:
+                logger.error(f"OpenWeather forecast error for {city}: {status}")
+                return []
                         
         except Exception as e:
             logger.error(f"OpenWeather forecast error for {city}: {str(e)}")
@@ -172,53 +360,83 @@ class KarnatakaWeatherAPI:
     
     def _parse_openweather_forecast(self, city: str, lat: float, lon: float, data: dict) -> List[WeatherData]:
         """Parse OpenWeather forecast response."""
-        forecasts = []
+        return self._parse_openweather_forecast_batch(city, lat, lon, data).rows()
+    
+    def _parse_openweather_forecast_batch(self, city: str, lat: float, lon: float, data: dict) -> WeatherBatch:
+        """Parse OpenWeather forecast response into a columnar batch."""
+        items = data.get('list', [])
+        n = len(items)
         
-        for item in data.get('list', []):
-            main = item.get('main', {})
-            weather = item.get('weather', [{}])[0]
-            wind = item.get('wind', {})
-            rain = item.get('rain', {})
-            
-            timestamp = datetime.fromtimestamp(item.get('dt', 0))
-            temperature = main.get('temp', 0)
-            humidity = main.get('humidity', 0)
-            pressure = main.get('pressure', 0)
-            wind_speed = wind.get('speed', 0) * 3.6
-            rainfall = rain.get('3h', 0) / 3  # Convert 3h to 1h average
-            visibility = item.get('visibility', 10000) / 1000
-            description = weather.get('description', '')
-            
-            lightning_risk = self._calculate_lightning_risk(description, wind_speed, humidity)
-            storm_alert = self._calculate_storm_alert(description, wind_speed, rainfall)
-            monsoon_intensity = self._calculate_monsoon_intensity(rainfall, humidity, description)
-            
-            forecasts.append(WeatherData(
-                timestamp=timestamp,
-                city=city,
-                latitude=lat,
-                longitude=lon,
-                temperature=temperature,
-                humidity=humidity,
-                wind_speed=wind_speed,
-                rainfall=rainfall,
-                pressure=pressure,
-                visibility=visibility,
-                weather_description=description,
-                lightning_risk=lightning_risk,
-                storm_alert=storm_alert,
-                monsoon_intensity=monsoon_intensity
-            ))
+        # Pull each field into a column in one pass over the items
+        mains = [item.get('main', {}) for item in items]
+        temperature = np.fromiter((m.get('temp', 0) for m in mains), dtype=np.float64, count=n)
+        humidity = np.fromiter((m.get('humidity', 0) for m in mains), dtype=np.float64, count=n)
+        pressure = np.fromiter((m.get('pressure', 0) for m in mains), dtype=np.float64, count=n)
+        wind_speed = np.fromiter((item.get('wind', {}).get('speed', 0) for item in items), dtype=np.float64, count=n) * 3.6
+        rainfall = np.fromiter((item.get('rain', {}).get('3h', 0) for item in items), dtype=np.float64, count=n) / 3  # Convert 3h to 1h average
+        visibility = np.fromiter((item.get('visibility', 10000) for item in items), dtype=np.float64, count=n) / 1000
+        descriptions = [item.get('weather', [{}])[0].get('description', '') for item in items]
+        epochs = np.fromiter((item.get('dt', 0) for item in items), dtype=np.int64, count=n)
         
-        return forecasts
+        lightning_risk, storm_alert, monsoon_intensity = self._derive_weather_risks(
+            _keyword_flags(descriptions), wind_speed, humidity, rainfall
+        )
+        
+        return WeatherBatch(
+            timestamp=self._local_timestamps(epochs),
+            city=np.full(n, city, dtype=object),
+            latitude=np.full(n, lat, dtype=np.float64),
+            longitude=np.full(n, lon, dtype=np.float64),
+            temperature=temperature,
+            humidity=humidity,
+            wind_speed=wind_speed,
+            rainfall=rainfall,
+            pressure=pressure,
+            visibility=visibility,
+            weather_description=np.array(descriptions, dtype=object),
+            lightning_risk=lightning_risk,
+            storm_alert=storm_alert,
+            monsoon_intensity=monsoon_intensity
+        )
+    
+    @staticmethod
+    def _local_timestamps(epochs: np.ndarray) -> np.ndarray:
+        """Convert Unix epochs to naive local-time datetime64[s], like datetime.fromtimestamp."""
+        if epochs.size == 0:
+            return epochs.astype('datetime64[s]')
+        # One UTC offset per batch: forecasts span a few days, so a DST change inside one is rare
+        offset = int(datetime.fromtimestamp(int(epochs[0])).astimezone().utcoffset().total_seconds())
+        return (epochs + offset).astype('datetime64[s]')
     
-    def _calculate_lightning_risk(self, description: str, wind_speed: float, humidity: float) -> int:
-        """Calculate lightning risk based on weather conditions."""
+    def _derive_weather_risks(self, keyword_flags: np.ndarray, wind_speed: np.ndarray,
+                              humidity: np.ndarray, rainfall: np.ndarray):
+        """Vectorized lightning risk, storm alert and monsoon intensity for a batch."""
+        has_lightning = (keyword_flags & _FLAG_LIGHTNING) != 0
+        has_severe = (keyword_flags & _FLAG_SEVERE) != 0
+        has_monsoon = (keyword_flags & _FLAG_MONSOON) != 0
+        
+        lightning_risk = np.where(has_lightning, 3, 0) + np.select(
+            [(wind_speed > 30) & (humidity > 70), (wind_speed > 20) & (humidity > 60)], [2, 1], 0
+        )
+        lightning_risk = np.minimum(lightning_risk, 5)  # Max risk level 5
+        
+        storm_alert = (has_severe | (wind_speed > 40) | (rainfall > 25)).astype(np.int64)
+        
+        monsoon_intensity = (
+            np.select([rainfall > 50, rainfall > 25, rainfall > 10], [0.5, 0.3, 0.1], 0.0)
+            + np.select([humidity > 85, humidity > 70], [0.3, 0.2], 0.0)
+            + np.where(has_monsoon, 0.2, 0.0)
+        )
+        monsoon_intensity = np.minimum(monsoon_intensity, 1.0)
+        
+        return lightning_risk, storm_alert, monsoon_intensity
+    
+    def _calculate_lightning_risk(self, description_lower: str, wind_speed: float, humidity: float) -> int:
+        """Calculate lightning risk based on weather conditions (description already lowercased)."""
         risk = 0
         
         # Description-based risk
-        lightning_keywords = ['thunder', 'lightning', 'storm']
-        if any(keyword in description.lower() for keyword in lightning_keywords):
+        if any(keyword in description_lower for keyword in _LIGHTNING_KEYWORDS):
             risk += 3
         
         # Wind and humidity factors
@@ -229,13 +447,12 @@ class KarnatakaWeatherAPI:
         
         return min(5, risk)  # Max risk level 5
     
-    def _calculate_storm_alert(self, description: str, wind_speed: float, rainfall: float) -> int:
-        """Calculate storm alert level."""
+    def _calculate_storm_alert(self, description_lower: str, wind_speed: float, rainfall: float) -> int:
+        """Calculate storm alert level (description already lowercased)."""
         alert = 0
         
         # Severe weather indicators
-        severe_keywords = ['severe', 'heavy', 'intense', 'extreme']
-        if any(keyword in description.lower() for keyword in severe_keywords):
+        if any(keyword in description_lower for keyword in _SEVERE_KEYWORDS):
             alert = 1
         
         # Wind-based alert
@@ -248,8 +465,8 @@ class KarnatakaWeatherAPI:
         
         return alert
     
-    def _calculate_monsoon_intensity(self, rainfall: float, humidity: float, description: str) -> float:
-        """Calculate monsoon intensity (0-1 scale)."""
+    def _calculate_monsoon_intensity(self, rainfall: float, humidity: float, description_lower: str) -> float:
+        """Calculate monsoon intensity (0-1 scale, description already lowercased)."""
         intensity = 0.0
         
         # Rainfall component
@@ -267,47 +484,47 @@ class KarnatakaWeatherAPI:
             intensity += 0.2
         
         # Description component
-        monsoon_keywords = ['rain', 'drizzle', 'shower', 'downpour']
-        if any(keyword in description.lower() for keyword in monsoon_keywords):
+        if any(keyword in description_lower for keyword in _MONSOON_KEYWORDS):
             intensity += 0.2
         
         return min(1.0, intensity)
     
     async def get_current_weather_all_cities(self) -> List[WeatherData]:
         """Get current weather for all Karnataka cities."""
-        tasks = []
-        
-        for city_name, coords in self.karnataka_cities.items():
-            task = self.get_openweather_current(
-                city_name, 
-                coords['lat'], 
-                coords['lon']
-            )
-            tasks.append(task)
+        cached = [self._current_cache.get(key) for key in zip(self._city_names, self._lats.tolist(), self._lons.tolist())]
+        if all(weather is not None for weather in cached):
+            return cached
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Filter successful results
-        weather_data = []
-        for result in results:
-            if isinstance(result, WeatherData):
-                weather_data.append(result)
+        async with self:
+            # One group request once city ids are known; per-city requests otherwise
+            weather_data = await self.get_group_current()
+            if weather_data is None:
+                tasks = [
+                    self.get_openweather_current(city_name, lat, lon)
+                    for city_name, lat, lon in zip(self._city_names, self._lats.tolist(), self._lons.tolist())
+                ]
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                
+                # Filter successful results
+                weather_data = [result for result in results if isinstance(result, WeatherData)]
         
         logger.info(f"Retrieved weather data for {len(weather_data)} Karnataka cities")
         return weather_data
     
     async def get_forecast_all_cities(self, hours: int = 24) -> Dict[str, List[WeatherData]]:
         """Get weather forecast for all Karnataka cities."""
-        forecasts = {}
-        
-        for city_name, coords in self.karnataka_cities.items():
-            forecast = await self.get_openweather_forecast(
-                city_name,
-                coords['lat'],
-                coords['lon'],
-                hours
-            )
-            forecasts[city_name] = forecast
+        tasks = [
+            self.get_openweather_forecast(city_name, lat, lon, hours)
+            for city_name, lat, lon in zip(self._city_names, self._lats.tolist(), self._lons.tolist())
+        ]
+        
+        async with self:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        forecasts = {
+            city_name: result if isinstance(result, list) else []
+            for city_name, result in zip(self._city_names, results)
+        }
         
         logger.info(f"Retrieved {hours}-hour forecasts for {len(forecasts)} Karnataka cities")
         return forecasts
@@ -326,34 +543,35 @@ class KarnatakaWeatherAPI:
             'monsoon_intensity': weather_data.monsoon_intensity
         }
     
-    def save_weather_data(self, weather_data: List[WeatherData], filename: str = None):
+    def _weather_frame(self, weather_data: Union[List[WeatherData], WeatherBatch]) -> pd.DataFrame:
+        """Convert weather records or a batch to a DataFrame with compact dtypes."""
+        if isinstance(weather_data, WeatherBatch):
+            columns = weather_data.to_columns()
+        else:
+            columns = {name: [getattr(wd, name) for wd in weather_data] for name in _WEATHER_FIELDS}
+        
+        for name, dtype in _WEATHER_DTYPES.items():
+            columns[name] = np.asarray(columns[name], dtype=dtype)
+        
+        return pd.DataFrame(columns)
+    
+    def save_weather_data(self, weather_data: Union[List[WeatherData], WeatherBatch], filename: str = None):
+        """Save weather data to a Parquet file."""
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"data/karnataka_weather_{timestamp}.parquet"
+        
+        df = self._weather_frame(weather_data)
+        df.to_parquet(filename, engine='pyarrow', compression='zstd', index=False)
+        logger.info(f"Saved weather data for {len(weather_data)} records to {filename}")
+    
+    def save_weather_data_csv(self, weather_data: Union[List[WeatherData], WeatherBatch], filename: str = None):
         """Save weather data to CSV file."""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"data/karnataka_weather_{timestamp}.csv"
         
-        # Convert to DataFrame
-        data_dicts = []
-        for wd in weather_data:
-            data_dict = {
-                'timestamp': wd.timestamp,
-                'city': wd.city,
-                'latitude': wd.latitude,
-                'longitude': wd.longitude,
-                'temperature': wd.temperature,
-                'humidity': wd.humidity,
-                'wind_speed': wd.wind_speed,
-                'rainfall': wd.rainfall,
-                'pressure': wd.pressure,
-                'visibility': wd.visibility,
-                'weather_description': wd.weather_description,
-                'lightning_risk': wd.lightning_risk,
-                'storm_alert': wd.storm_alert,
-                'monsoon_intensity': wd.monsoon_intensity
-            }
-            data_dicts.append(data_dict)
-        
-        df = pd.DataFrame(data_dicts)
+        df = self._weather_frame(weather_data)
         df.to_csv(filename, index=False)
         logger.info(f"Saved weather data for {len(weather_data)} records to {filename}")
 
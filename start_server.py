@@ -9,6 +9,19 @@ import uvicorn
 import asyncio
 import logging
 
+# Faster event loop and HTTP parser (installed with uvicorn[standard]; uvloop has no Windows build)
+try:
+    import uvloop  # noqa: F401
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import httptools  # noqa: F401
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
@@ -24,9 +37,12 @@ async def test_components():
     try:
         logger.info("Testing API components...")
         
-        # Test model loading
+        # Load the model once and hand it to the app so routes reuse it
+        from src.api.main import app
         from src.api.routes.predictions import get_model_instance
-        model = get_model_instance()
+        if not hasattr(app.state, 'model'):
+            app.state.model = get_model_instance()
+        model = app.state.model
         logger.info(f"✓ Model loaded: {type(model).__name__}")
         
         # Test sample prediction
@@ -39,7 +55,6 @@ async def test_components():
         logger.info(f"✓ Sample prediction: {result['risk_score']:.1f}% risk")
         
         # Test API app creation
-        from src.api.main import app
         logger.info(f"✓ API app created with {len(app.routes)} routes")
         
         logger.info("All components tested successfully!")
@@ -64,11 +79,15 @@ def main():
     try:
         logger.info("Starting Uvicorn server on http://127.0.0.1:8000")
         
+        # Pass the app object itself so the pre-warmed app.state.model is kept
+        from src.api.main import app
         uvicorn.run(
-            "src.api.main:app",
+            app,
             host="127.0.0.1",
             port=8000,
             reload=False,  # Disable reload for stability
+            loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+            http="httptools" if HTTPTOOLS_AVAILABLE else "h11",
             log_level="info",
             access_log=True
         )
@@ -3,22 +3,28 @@
 Complete application startup script - Backend + Frontend
 """
 
-import subprocess
+import asyncio
 import sys
 import os
 import time
 import webbrowser
 from pathlib import Path
 
-def start_backend():
+import aiohttp
+
+BACKEND_HEALTH_URL = "http://127.0.0.1:8000/health"
+FRONTEND_URL = "http://localhost:3000"
+
+async def start_backend():
     """Start the backend API server."""
     print("Starting Backend API Server...")
-    backend_process = subprocess.Popen([
-        sys.executable, "-m", "uvicorn", "src.api.main:app", "--reload", "--port", "8000"
-    ], cwd=os.getcwd())
+    backend_process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "src.api.main:app", "--reload", "--port", "8000",
+        cwd=os.getcwd()
+    )
     return backend_process
 
-def start_frontend():
+async def start_frontend():
     """Start the frontend React development server."""
     print("Starting Frontend React App...")
     frontend_dir = Path("frontend")
@@ -30,29 +36,47 @@ def start_frontend():
     # Check if node_modules exists
     if not (frontend_dir / "node_modules").exists():
         print("Installing frontend dependencies...")
-        subprocess.run(["npm", "install"], cwd=frontend_dir, check=True)
+        install = await asyncio.create_subprocess_exec("npm", "install", cwd=frontend_dir)
+        if await install.wait() != 0:
+            raise RuntimeError("npm install failed")
     
-    frontend_process = subprocess.Popen([
-        "npm", "start"
-    ], cwd=frontend_dir)
+    frontend_process = await asyncio.create_subprocess_exec("npm", "start", cwd=frontend_dir)
     return frontend_process
 
-def main():
+async def wait_ready(url, timeout=30):
+    """Poll url until it answers without a server error, or until timeout seconds pass."""
+    start = time.monotonic()
+    delay = 0.01
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() - start < timeout:
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=0.2)) as response:
+                    if response.status < 500:
+                        return True
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+    return False
+
+async def main():
     """Main startup function."""
     print("STARTING 24-HOUR POWER OUTAGE FORECASTING SYSTEM")
     print("=" * 60)
     
+    backend = frontend = None
     try:
         # Start backend
-        backend = start_backend()
+        backend = await start_backend()
         print("Backend starting on http://127.0.0.1:8000")
         
-        # Wait a moment for backend to initialize
+        # Wait until the backend answers its health check
         print("Waiting for backend to initialize...")
-        time.sleep(5)
+        if not await wait_ready(BACKEND_HEALTH_URL):
+            print("Backend did not report healthy yet, continuing anyway")
         
         # Start frontend
-        frontend = start_frontend()
+        frontend = await start_frontend()
         print("Frontend starting on http://localhost:3000")
         
         print("\nBOTH SERVERS STARTING!")
@@ -63,29 +87,31 @@ def main():
         print("Press Ctrl+C to stop both servers")
         print("=" * 60)
         
-        # Wait a bit more for frontend to start
-        time.sleep(10)
+        # Wait for the frontend dev server before opening the browser
+        if frontend is not None:
+            await wait_ready(FRONTEND_URL, timeout=120)
         
         # Open browser to frontend
         try:
-            webbrowser.open("http://localhost:3000")
+            webbrowser.open(FRONTEND_URL)
         except:
             print("Please manually open: http://localhost:3000")
         
         # Wait for processes
-        frontend.wait()
-        backend.wait()
-        
-    except KeyboardInterrupt:
+        await asyncio.gather(*(proc.wait() for proc in (frontend, backend) if proc is not None))
+    
+    except asyncio.CancelledError:
         print("\nShutting down servers...")
-        if 'backend' in locals():
-            backend.terminate()
-        if 'frontend' in locals():
-            frontend.terminate()
+        for proc in (backend, frontend):
+            if proc is not None and proc.returncode is None:
+                proc.terminate()
         print("Servers stopped")
     except Exception as e:
         print(f"Error starting application: {e}")
         print("Make sure Node.js is installed for the frontend")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -3,10 +3,28 @@
 Simple client to test the Power Outage Forecasting API.
 """
 
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from datetime import datetime
 
+def make_session():
+    """Session with a small keep-alive pool shared by every request in this client."""
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return session
+
+async def run_predictions(session, base_url, payloads):
+    """Post live prediction requests concurrently, returning responses or exceptions."""
+    return await asyncio.gather(
+        *(
+            asyncio.to_thread(session.post, f"{base_url}/api/v1/predict/live", json=payload, timeout=10)
+            for payload in payloads
+        ),
+        return_exceptions=True
+    )
+
 def test_api():
     """Test the running API server."""
     base_url = "http://127.0.0.1:8000"
@@ -14,10 +32,24 @@ def test_api():
     print("🔮 POWER OUTAGE FORECASTING API CLIENT")
     print("=" * 50)
     
+    with make_session() as session:
+        if not _run_checks(session, base_url):
+            return
+    
+    print(f"\nAPI Documentation: {base_url}/docs")
+    print(f"Health Check: {base_url}/health")
+    print(f"🔮 All Endpoints: {base_url}/api/v1/")
+    print("\nAPI Testing Complete!")
+
+def _run_checks(session, base_url):
+    """Run the health check and the two live predictions over one session.
+    
+    Returns False when the server is not reachable or unhealthy.
+    """
     # Test health endpoint
     print("\n1. Testing Health Endpoint...")
     try:
-        response = requests.get(f"{base_url}/health", timeout=5)
+        response = session.get(f"{base_url}/health", timeout=5)
         if response.status_code == 200:
             print("Server is healthy!")
             health_data = response.json()
@@ -25,14 +57,12 @@ def test_api():
             print(f"   Version: {health_data['version']}")
         else:
             print(f"Health check failed: {response.status_code}")
-            return
+            return False
     except Exception as e:
         print(f"Cannot connect to server: {e}")
         print("Make sure the server is running with: python run_server.py")
-        return
+        return False
     
-    # Test live prediction for Bengaluru
-    print("\n2. Testing Live Prediction for Bengaluru...")
     live_request = {
         "latitude": 12.9716,
         "longitude": 77.5946,
@@ -46,12 +76,30 @@ def test_api():
         }
     }
     
+    high_risk_request = {
+        "latitude": 12.9716,
+        "longitude": 77.5946,
+        "grid_data": {
+            "substation_id": "BESCOM_BLR_001",
+            "load_factor": 0.95,  # Very high load
+            "voltage_stability": 0.60,  # Poor stability
+            "historical_outages": 8,  # Many past outages
+            "maintenance_status": True,  # Under maintenance
+            "feeder_health": 0.50  # Poor health
+        }
+    }
+    
+    # Both predictions are independent, so issue them concurrently
+    live_response, high_risk_response = asyncio.run(
+        run_predictions(session, base_url, [live_request, high_risk_request])
+    )
+    
+    # Test live prediction for Bengaluru
+    print("\n2. Testing Live Prediction for Bengaluru...")
     try:
-        response = requests.post(
-            f"{base_url}/api/v1/predict/live", 
-            json=live_request,
-            timeout=10
-        )
+        if isinstance(live_response, Exception):
+            raise live_response
+        response = live_response
         
         if response.status_code == 200:
             result = response.json()
@@ -69,25 +117,10 @@ def test_api():
     
     # Test prediction with high-risk scenario
     print("\n3. Testing High-Risk Scenario...")
-    high_risk_request = {
-        "latitude": 12.9716,
-        "longitude": 77.5946,
-        "grid_data": {
-            "substation_id": "BESCOM_BLR_001",
-            "load_factor": 0.95,  # Very high load
-            "voltage_stability": 0.60,  # Poor stability
-            "historical_outages": 8,  # Many past outages
-            "maintenance_status": True,  # Under maintenance
-            "feeder_health": 0.50  # Poor health
-        }
-    }
-    
     try:
-        response = requests.post(
-            f"{base_url}/api/v1/predict/live", 
-            json=high_risk_request,
-            timeout=10
-        )
+        if isinstance(high_risk_response, Exception):
+            raise high_risk_response
+        response = high_risk_response
         
         if response.status_code == 200:
             result = response.json()
@@ -101,10 +134,7 @@ def test_api():
     except Exception as e:
         print(f"High-risk request failed: {e}")
     
-    print(f"\nAPI Documentation: {base_url}/docs")
-    print(f"Health Check: {base_url}/health")
-    print(f"🔮 All Endpoints: {base_url}/api/v1/")
-    print("\nAPI Testing Complete!")
+    return True
 
 if __name__ == "__main__":
     test_api()
\ No newline at end of file
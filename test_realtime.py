@@ -9,9 +9,61 @@ import asyncio
 import json
 from datetime import datetime
 
+from cachetools import TTLCache
+
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
+# Concurrent OpenWeather calls allowed at once, and the most one call may take
+MAX_CONCURRENT_REQUESTS = 5
+REQUEST_TIMEOUT = 5
+
+# Parsed current weather per city; OpenWeather only refreshes about every 10 minutes
+_WEATHER_CACHE = TTLCache(maxsize=256, ttl=300)
+
+async def _get_json(client, city, path, params):
+    """GET path and decode the JSON body, returning None on a non-200 status."""
+    response = await client.get(path, params=params)
+    if response.status_code != 200:
+        print(f"  ❌ {city}: API error {response.status_code}")
+        return None
+    return response.json()
+
+async def fetch_one(client, sem, city, api_key):
+    """Fetch current weather for one city, returning None on an API error."""
+    if city in _WEATHER_CACHE:
+        return _WEATHER_CACHE[city]
+    
+    params = {
+        'q': city,
+        'appid': api_key,
+        'units': 'metric'
+    }
+    
+    async with sem:
+        data = await asyncio.wait_for(_get_json(client, city, "/data/2.5/weather", params), timeout=REQUEST_TIMEOUT)
+    if data is None:
+        return None
+    
+    weather = {
+        'temperature': data['main']['temp'],
+        'humidity': data['main']['humidity'],
+        'pressure': data['main']['pressure'],
+        'weather': data['weather'][0]['description'],
+        'wind_speed': data.get('wind', {}).get('speed', 0) * 3.6,  # m/s to km/h
+        'clouds': data.get('clouds', {}).get('all', 0),
+        'visibility': data.get('visibility', 10000) / 1000  # m to km
+    }
+    _WEATHER_CACHE[city] = weather
+    return weather
+
+async def fetch_labeled(client, sem, city, api_key):
+    """Run fetch_one, returning (city, weather or the exception it raised)."""
+    try:
+        return city, await fetch_one(client, sem, city, api_key)
+    except Exception as e:
+        return city, e
+
 async def test_real_time_api():
     """Test the real-time API functionality directly."""
     print("=" * 60)
@@ -21,7 +73,7 @@ async def test_real_time_api():
     try:
         # Import and test weather integration
         print("\n1. Testing Live Weather Integration...")
-        import aiohttp
+        import httpx
         from dotenv import load_dotenv
         
         load_dotenv()
@@ -38,34 +90,21 @@ async def test_real_time_api():
         ]
         
         weather_data = {}
-        async with aiohttp.ClientSession() as session:
-            for city in karnataka_cities:
-                try:
-                    url = "http://api.openweathermap.org/data/2.5/weather"
-                    params = {
-                        'q': city,
-                        'appid': api_key,
-                        'units': 'metric'
-                    }
-                    
-                    async with session.get(url, params=params) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            weather_data[city] = {
-                                'temperature': data['main']['temp'],
-                                'humidity': data['main']['humidity'],
-                                'pressure': data['main']['pressure'],
-                                'weather': data['weather'][0]['description'],
-                                'wind_speed': data.get('wind', {}).get('speed', 0) * 3.6,  # m/s to km/h
-                                'clouds': data.get('clouds', {}).get('all', 0),
-                                'visibility': data.get('visibility', 10000) / 1000  # m to km
-                            }
-                            print(f"  ✓ {city}: {data['main']['temp']}°C, {data['weather'][0]['description']}")
-                        else:
-                            print(f"  ❌ {city}: API error {response.status}")
-                            
-                except Exception as e:
-                    print(f"  ❌ {city}: {e}")
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # One pooled HTTP/2 connection multiplexes all city requests
+        limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        async with httpx.AsyncClient(http2=True, base_url="https://api.openweathermap.org",
+                                     limits=limits, timeout=REQUEST_TIMEOUT) as client:
+            tasks = [fetch_labeled(client, sem, city, api_key) for city in karnataka_cities]
+            
+            # Report each city as soon as its response arrives
+            for next_done in asyncio.as_completed(tasks):
+                city, result = await next_done
+                if isinstance(result, Exception):
+                    print(f"  ❌ {city}: {str(result) or type(result).__name__}")
+                elif result is not None:
+                    weather_data[city] = result
+                    print(f"  ✓ {city}: {result['temperature']}°C, {result['weather']}")
         
         print(f"✓ Weather data retrieved for {len(weather_data)} cities")
         
@@ -79,42 +118,43 @@ async def test_real_time_api():
         # Test predictions for each city with current weather
         print("\n3. Testing Real-Time Predictions...")
         predictions = {}
+        inputs = []
         
-        for city, weather in weather_data.items():
-            try:
-                # Simulate grid conditions (in real app, this would come from utility data)
-                grid_data = {
-                    'load_factor': 0.75 + (weather['temperature'] - 20) * 0.01,  # Higher load in extreme temps
-                    'voltage_stability': max(0.7, 0.95 - weather['wind_speed'] * 0.02),  # Wind affects stability
-                    'historical_outages': 3,
-                    'transformer_load': 0.8,
-                    'feeder_health': max(0.6, 0.9 - weather['humidity'] * 0.002)  # Humidity affects equipment
-                }
-                
-                # Prepare prediction input
-                prediction_input = {
-                    'weather': {
-                        'temperature': weather['temperature'],
-                        'humidity': weather['humidity'],
-                        'wind_speed': weather['wind_speed'],
-                        'rainfall': 0,  # Current weather doesn't include rainfall forecast
-                        'lightning_strikes': 0,
-                        'storm_alert': weather['wind_speed'] > 25 or 'storm' in weather['weather'].lower()
-                    },
-                    'grid': grid_data,
-                    'prediction_horizon': 24
-                }
-                
-                # Make prediction
-                result = await model.predict(prediction_input, include_explanation=True)
+        for weather in weather_data.values():
+            # Simulate grid conditions (in real app, this would come from utility data)
+            grid_data = {
+                'load_factor': 0.75 + (weather['temperature'] - 20) * 0.01,  # Higher load in extreme temps
+                'voltage_stability': max(0.7, 0.95 - weather['wind_speed'] * 0.02),  # Wind affects stability
+                'historical_outages': 3,
+                'transformer_load': 0.8,
+                'feeder_health': max(0.6, 0.9 - weather['humidity'] * 0.002)  # Humidity affects equipment
+            }
+            
+            # Prepare prediction input
+            inputs.append({
+                'weather': {
+                    'temperature': weather['temperature'],
+                    'humidity': weather['humidity'],
+                    'wind_speed': weather['wind_speed'],
+                    'rainfall': 0,  # Current weather doesn't include rainfall forecast
+                    'lightning_strikes': 0,
+                    'storm_alert': weather['wind_speed'] > 25 or 'storm' in weather['weather'].lower()
+                },
+                'grid': grid_data,
+                'prediction_horizon': 24
+            })
+        
+        # Score every city in one batched call, explanations included
+        try:
+            results = await model.predict_batch(inputs, include_explanation=True)
+            for city, result in zip(weather_data, results):
                 predictions[city] = result
                 
                 risk_level = "🔴 HIGH" if result['risk_score'] > 60 else "🟡 MEDIUM" if result['risk_score'] > 30 else "🟢 LOW"
                 print(f"  {city}: {result['risk_score']:.1f}% {risk_level}")
                 print(f"    Factors: {', '.join(result['contributing_factors'][:2])}")
-                
-            except Exception as e:
-                print(f"  ❌ {city}: Prediction failed - {e}")
+        except Exception as e:
+            print(f"  ❌ Batch prediction failed - {e}")
         
         # Test API endpoints directly
         print("\n4. Testing API Endpoints...")
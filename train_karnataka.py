@@ -4,10 +4,12 @@ Karnataka Power Outage Forecasting - Real ML Training Pipeline
 Trains LSTM + XGBoost ensemble specifically for Karnataka data
 """
 
+import argparse
 import sys
 import os
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from datetime import datetime, timedelta
 import logging
 from pathlib import Path
@@ -17,7 +19,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 # ML imports
 from sklearn.model_selection import train_test_split, TimeSeriesSplit
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score
 import xgboost as xgb
 
@@ -28,8 +30,11 @@ from tensorflow.keras.layers import LSTM, Dense, Dropout, BatchNormalization
 from tensorflow.keras.optimizers import Adam
 from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
 
-# Explainability
-import shap
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 from utils.logger import setup_logging, get_logger
 
@@ -37,6 +42,78 @@ from utils.logger import setup_logging, get_logger
 setup_logging()
 logger = get_logger(__name__)
 
+# Compact dtypes for the dataset columns, applied at load time
+_DATASET_DTYPES = {
+    'city': 'category', 'escom_zone': 'category',
+    'priority_tier': 'int8', 'hour_of_day': 'int8', 'day_of_week': 'int8',
+    'month': 'int8', 'season': 'int8', 'storm_alert': 'int8',
+    'maintenance_status': 'int8', 'outage_occurred': 'int8',
+    'lightning_strikes': 'int16', 'historical_outages': 'int16',
+    'latitude': 'float32', 'longitude': 'float32',
+    'temperature': 'float32', 'humidity': 'float32', 'wind_speed': 'float32', 'rainfall': 'float32',
+    'load_factor': 'float32', 'voltage_stability': 'float32',
+    'feeder_health': 'float32', 'transformer_load': 'float32'
+}
+
+def _xgb_cuda_available():
+    """Whether the installed XGBoost build can train and predict on CUDA devices."""
+    try:
+        return bool(xgb.build_info().get('USE_CUDA'))
+    except Exception:
+        return False
+
+
+# Datasets at least this long build LSTM sequences with the parallel JIT kernel
+_NUMBA_MIN_ROWS = 10000
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _fill_sequences_jit(weather, target, starts, lengths, offsets, sequence_length, X_out, y_out):
+        # One city block per prange iteration; blocks write to disjoint output slices
+        for k in prange(starts.size):
+            start = starts[k]
+            for i in range(lengths[k] - sequence_length):
+                row = offsets[k] + i
+                for t in range(sequence_length):
+                    for f in range(weather.shape[1]):
+                        X_out[row, t, f] = weather[start + i + t, f]
+                y_out[row] = target[start + i + sequence_length]
+
+
+class BoosterClassifier:
+    """Classifier-style wrapper around a raw XGBoost Booster trained with xgb.train."""
+    
+    def __init__(self, booster):
+        self.booster = booster
+    
+    def get_booster(self):
+        return self.booster
+    
+    @property
+    def iteration_range(self):
+        """Trees up to the best early-stopping round; later rounds are not part of the model."""
+        return (0, self.booster.best_iteration + 1)
+    
+    def best_booster(self):
+        """The booster sliced to the best early-stopping round."""
+        return self.booster[slice(*self.iteration_range)]
+    
+    def predict_dmatrix(self, dmatrix):
+        """Positive-class probabilities, using the trees up to the best early-stopping round."""
+        return self.booster.predict(dmatrix, iteration_range=self.iteration_range)
+    
+    def predict_proba(self, X):
+        proba = self.predict_dmatrix(xgb.DMatrix(X))
+        return np.column_stack([1 - proba, proba])
+    
+    def predict(self, X):
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+    
+    def save_model(self, fname):
+        """Save only the trees up to the best round, so a plain Booster.predict on reload matches training."""
+        self.best_booster().save_model(fname)
+
 
 class KarnatakaPowerOutagePredictor:
     """Real ML pipeline for Karnataka power outage prediction."""
@@ -69,20 +146,23 @@ class KarnatakaPowerOutagePredictor:
     
     def load_karnataka_data(self):
         """Load the generated Karnataka dataset."""
-        data_path = Path("data/karnataka_power_outage_dataset.csv")
-        
-        if not data_path.exists():
+        data_path = Path("data/karnataka_power_outage_dataset.parquet")
+        csv_path = data_path.with_suffix(".csv")
+        
+        if data_path.exists():
+            logger.info("Loading Karnataka power outage dataset...")
+            df = pd.read_parquet(data_path, engine='pyarrow')  # Timestamps arrive already typed
+            df = df.astype({col: dtype for col, dtype in _DATASET_DTYPES.items() if col in df.columns})
+        elif csv_path.exists():
+            logger.info("Loading Karnataka power outage dataset from CSV "
+                        "(run scripts/convert_dataset_to_parquet.py for faster loads)...")
+            df = pd.read_csv(csv_path, dtype=_DATASET_DTYPES, parse_dates=['timestamp'])
+        else:
             logger.error("Karnataka dataset not found. Run data/karnataka_data_loader.py first")
             raise FileNotFoundError("Karnataka dataset not found")
         
-        logger.info("Loading Karnataka power outage dataset...")
-        df = pd.read_csv(data_path)
-        
-        # Convert timestamp
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        
         # Sort by timestamp
-        df = df.sort_values('timestamp').reset_index(drop=True)
+        df = df.sort_values('timestamp', ignore_index=True)
         
         logger.info(f"Loaded {len(df)} records from {df['timestamp'].min()} to {df['timestamp'].max()}")
         logger.info(f"Cities: {list(df['city'].unique())}")
@@ -98,22 +178,22 @@ class KarnatakaPowerOutagePredictor:
         all_features = (self.weather_features + self.grid_features + 
                        self.temporal_features + self.contextual_features)
         
-        # Encode categorical features
-        le_city = LabelEncoder()
-        df['city_encoded'] = le_city.fit_transform(df['city'])
-        
-        le_escom = LabelEncoder()
-        df['escom_encoded'] = le_escom.fit_transform(df['escom_zone'])
+        # Encode categorical features; categories are sorted, so codes match LabelEncoder's
+        df['city_encoded'] = df['city'].cat.codes.astype(np.int16)
+        df['escom_encoded'] = df['escom_zone'].cat.codes.astype(np.int16)
         
         # Add encoded features
         all_features.extend(['city_encoded', 'escom_encoded'])
         
-        # Create feature matrix
-        X = df[all_features].copy()
+        # Create feature matrix as float32, the precision XGBoost trains at
+        X = df[all_features].to_numpy(dtype=np.float32, copy=True)
         y = df[self.target_column].copy()
         
-        # Handle missing values
-        X = X.fillna(X.mean())
+        # Handle missing values with column means
+        missing = np.isnan(X)
+        if missing.any():
+            col_means = np.nanmean(X, axis=0, dtype=np.float64)
+            X[missing] = np.take(col_means, np.nonzero(missing)[1])
         
         self.feature_columns = all_features
         logger.info(f"Prepared {len(all_features)} features: {all_features}")
@@ -124,30 +204,60 @@ class KarnatakaPowerOutagePredictor:
         """Create LSTM sequences for weather patterns."""
         logger.info(f"Creating LSTM sequences with length {sequence_length}")
         
+        weather, target, starts, lengths = self._city_blocks(df)
+        
+        if NUMBA_AVAILABLE and len(weather) >= _NUMBA_MIN_ROWS:
+            n_seq = np.maximum(lengths - sequence_length, 0)
+            offsets = np.concatenate(([0], np.cumsum(n_seq)[:-1]))
+            X_seq = np.empty((int(n_seq.sum()), sequence_length, weather.shape[1]), dtype=np.float32)
+            y_seq = np.empty(len(X_seq), dtype=target.dtype)
+            _fill_sequences_jit(weather, target, starts, lengths, offsets, sequence_length, X_seq, y_seq)
+            logger.info(f"Created {len(X_seq)} sequences of shape {X_seq.shape}")
+            return X_seq, y_seq
+        
         sequences = []
         targets = []
         
-        # Group by city for sequence creation
-        for city in df['city'].unique():
-            city_data = df[df['city'] == city].sort_values('timestamp')
+        # Walk each city's contiguous block
+        for start, length in zip(starts.tolist(), lengths.tolist()):
+            if length <= sequence_length:
+                continue
+            
+            # Every 24-hour weather window as a view, dropping the last one (it has no next hour)
+            block = weather[start:start + length]
+            windows = sliding_window_view(block, (sequence_length, block.shape[1]))[:-1, 0]
             
-            # Create sequences for this city
-            for i in range(len(city_data) - sequence_length):
-                # Weather sequence (past 24 hours)
-                weather_seq = city_data[self.weather_features].iloc[i:i+sequence_length].values
-                
-                # Target (next hour outage)
-                target = city_data[self.target_column].iloc[i+sequence_length]
-                
-                sequences.append(weather_seq)
-                targets.append(target)
-        
-        X_seq = np.array(sequences)
-        y_seq = np.array(targets)
-        
-        logger.info(f"Created {len(sequences)} sequences of shape {X_seq.shape}")
+            sequences.append(windows)
+            targets.append(target[start + sequence_length:start + length])
+        
+        if sequences:
+            X_seq = np.concatenate(sequences)
+            y_seq = np.concatenate(targets)
+        else:
+            X_seq = np.empty((0, sequence_length, len(self.weather_features)), dtype=np.float32)
+            y_seq = np.empty(0)
+        
+        logger.info(f"Created {len(X_seq)} sequences of shape {X_seq.shape}")
         return X_seq, y_seq
     
+    def _city_blocks(self, df):
+        """Lay weather and target rows out city by city, each block in timestamp order.
+        
+        Cities keep their order of first appearance in df. Returns the float32
+        weather matrix, the target array, and each block's start and length.
+        """
+        codes, _ = pd.factorize(df['city'])  # -1 marks a missing city
+        known = codes >= 0
+        codes = codes[known]
+        
+        order = np.lexsort((df['timestamp'].to_numpy()[known], codes))
+        weather = np.ascontiguousarray(df[self.weather_features].to_numpy(dtype=np.float32)[known][order])
+        target = df[self.target_column].to_numpy()[known][order]
+        
+        lengths = np.bincount(codes)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        return weather, target, starts, lengths
+    
     def train_lstm_model(self, X_seq, y_seq):
         """Train LSTM model for weather sequence analysis."""
         logger.info("Training LSTM model for weather patterns...")
@@ -157,13 +267,37 @@ class KarnatakaPowerOutagePredictor:
             X_seq, y_seq, test_size=0.2, random_state=42, stratify=y_seq
         )
         
-        # Scale features
+        # Scale features in place as float32; the split arrays are fresh copies of X_seq
         self.scaler = StandardScaler()
-        X_train_scaled = self.scaler.fit_transform(X_train.reshape(-1, X_train.shape[-1]))
-        X_train_scaled = X_train_scaled.reshape(X_train.shape)
+        self.scaler.fit(X_train.reshape(-1, X_train.shape[-1]))
+        
+        X_train_scaled = X_train.astype(np.float32, copy=False)
+        X_train_scaled -= self.scaler.mean_
+        X_train_scaled /= self.scaler.scale_
+        
+        X_test_scaled = X_test.astype(np.float32, copy=False)
+        X_test_scaled -= self.scaler.mean_
+        X_test_scaled /= self.scaler.scale_
+        
+        # Input pipelines that overlap batching and host-to-device copies with training
+        train_ds = (
+            tf.data.Dataset.from_tensor_slices((X_train_scaled, y_train))
+            .shuffle(8192, reshuffle_each_iteration=True)
+            .batch(32)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+        val_ds = (
+            tf.data.Dataset.from_tensor_slices((X_test_scaled, y_test))
+            .batch(32)
+            .cache()
+            .prefetch(tf.data.AUTOTUNE)
+        )
         
-        X_test_scaled = self.scaler.transform(X_test.reshape(-1, X_test.shape[-1]))
-        X_test_scaled = X_test_scaled.reshape(X_test.shape)
+        # Half-precision compute where the GPU has tensor cores for it (compute capability 8.0+)
+        gpus = tf.config.list_physical_devices('GPU')
+        if gpus and tf.config.experimental.get_device_details(gpus[0]).get('compute_capability', (0, 0)) >= (8, 0):
+            tf.keras.mixed_precision.set_global_policy('mixed_float16')
+            logger.info("Using mixed_float16 precision for LSTM training")
         
         # Build LSTM model
         model = Sequential([
@@ -178,7 +312,7 @@ class KarnatakaPowerOutagePredictor:
             Dense(16, activation='relu'),
             Dropout(0.1),
             
-            Dense(1, activation='sigmoid')
+            Dense(1, activation='sigmoid', dtype='float32')  # Keep the output in float32 under mixed precision
         ])
         
         model.compile(
@@ -195,16 +329,15 @@ class KarnatakaPowerOutagePredictor:
         
         # Train model
         history = model.fit(
-            X_train_scaled, y_train,
+            train_ds,
             epochs=50,
-            batch_size=32,
-            validation_data=(X_test_scaled, y_test),
+            validation_data=val_ds,
             callbacks=callbacks,
             verbose=1
         )
         
         # Evaluate
-        test_loss, test_acc, test_prec, test_rec = model.evaluate(X_test_scaled, y_test, verbose=0)
+        test_loss, test_acc, test_prec, test_rec = model.evaluate(val_ds, verbose=0)
         logger.info(f"LSTM Test Results - Loss: {test_loss:.4f}, Accuracy: {test_acc:.4f}")
         logger.info(f"LSTM Precision: {test_prec:.4f}, Recall: {test_rec:.4f}")
         
@@ -212,7 +345,10 @@ class KarnatakaPowerOutagePredictor:
         return history
     
     def train_xgboost_model(self, X, y):
-        """Train XGBoost model for tabular features."""
+        """Train XGBoost model for tabular features.
+        
+        Returns the model, its test-split probabilities and the split index.
+        """
         logger.info("Training XGBoost model for grid and contextual features...")
         
         # Split data with time series consideration
@@ -220,31 +356,46 @@ class KarnatakaPowerOutagePredictor:
         X_train, X_test = X[:split_idx], X[split_idx:]
         y_train, y_test = y[:split_idx], y[split_idx:]
         
+        # Histogram tree building, on the GPU when the XGBoost build supports CUDA
+        use_gpu = _xgb_cuda_available()
+        
         # Train XGBoost
         xgb_params = {
             'objective': 'binary:logistic',
             'eval_metric': 'auc',
+            'tree_method': 'gpu_hist' if use_gpu else 'hist',
+            'max_bin': 256,
             'max_depth': 6,
             'learning_rate': 0.1,
-            'n_estimators': 200,
             'subsample': 0.8,
             'colsample_bytree': 0.8,
-            'random_state': 42,
-            'early_stopping_rounds': 20
+            'seed': 42
         }
         
-        self.xgb_model = xgb.XGBClassifier(**xgb_params)
+        # Build the training and evaluation matrices once; the training one is binned up front
+        dtrain = xgb.QuantileDMatrix(X_train, y_train, max_bin=256)
+        dtest = xgb.DMatrix(X_test, y_test)
         
         # Train with early stopping
-        self.xgb_model.fit(
-            X_train, y_train,
-            eval_set=[(X_test, y_test)],
-            verbose=True
+        train_kwargs = dict(
+            num_boost_round=200,
+            evals=[(dtest, 'test')],
+            early_stopping_rounds=20,
+            verbose_eval=True
         )
+        try:
+            booster = xgb.train(xgb_params, dtrain, **train_kwargs)
+        except xgb.core.XGBoostError as e:
+            if not use_gpu:
+                raise
+            logger.warning(f"GPU training failed ({e}); retrying with tree_method='hist'")
+            xgb_params['tree_method'] = 'hist'
+            booster = xgb.train(xgb_params, dtrain, **train_kwargs)
+        self.xgb_model = BoosterClassifier(booster)
         
         # Evaluate
-        y_pred = self.xgb_model.predict(X_test)
-        y_pred_proba = self.xgb_model.predict_proba(X_test)[:, 1]
+        y_pred_proba = self.xgb_model.predict_dmatrix(dtest)
+        y_pred = (y_pred_proba > 0.5).astype(int)
         
         auc_score = roc_auc_score(y_test, y_pred_proba)
         logger.info(f"XGBoost AUC Score: {auc_score:.4f}")
@@ -253,15 +404,45 @@ class KarnatakaPowerOutagePredictor:
         logger.info("XGBoost Classification Report:")
         logger.info(classification_report(y_test, y_pred))
         
-        return self.xgb_model
+        return self.xgb_model, y_pred_proba, split_idx
+    
+    def compute_feature_importance(self):
+        """Rank features by XGBoost total gain, recorded during training."""
+        raw = self.xgb_model.best_booster().get_score(importance_type='total_gain')
+        
+        # Booster keys are f0, f1, ... since training used a plain array; unused features score 0
+        feature_importance = pd.DataFrame({
+            'feature': self.feature_columns,
+            'importance': [raw.get(f"f{i}", 0.0) for i in range(len(self.feature_columns))]
+        }).sort_values('importance', ascending=False)
+        
+        logger.info("Top 10 Most Important Features (total gain):")
+        for _, row in feature_importance.head(10).iterrows():
+            logger.info(f"  {row['feature']}: {row['importance']:.4f}")
+        
+        return feature_importance
     
     def generate_shap_explanations(self, X_sample):
         """Generate SHAP explanations for model predictions."""
         logger.info("Generating SHAP explanations...")
         
-        # Create explainer for XGBoost
-        explainer = shap.TreeExplainer(self.xgb_model)
-        shap_values = explainer.shap_values(X_sample.iloc[:100])  # Sample for speed
+        # XGBoost's native TreeSHAP: one contribution per feature plus a trailing bias column
+        booster = self.xgb_model.get_booster()
+        dsample = xgb.DMatrix(X_sample)
+        contribs = None
+        if _xgb_cuda_available():
+            # GPU predictor on a copy, so the saved model keeps its own predictor setting
+            gpu_booster = booster.copy()
+            gpu_booster.set_param({'predictor': 'gpu_predictor'})
+            try:
+                contribs = gpu_booster.predict(dsample, pred_contribs=True,
+                                               iteration_range=self.xgb_model.iteration_range)
+            except xgb.core.XGBoostError as e:
+                logger.warning(f"GPU SHAP failed ({e}); computing on the CPU")
+        if contribs is None:
+            contribs = booster.predict(dsample, pred_contribs=True,
+                                       iteration_range=self.xgb_model.iteration_range)
+        shap_values = contribs[:, :-1]
         
         # Feature importance
         feature_importance = pd.DataFrame({
@@ -280,23 +461,32 @@ class KarnatakaPowerOutagePredictor:
         save_path = Path(save_dir)
         save_path.mkdir(parents=True, exist_ok=True)
         
-        # Save LSTM model
+        # Save LSTM model (Keras v3 archive) plus an FP16 TFLite export for lightweight inference
         if self.lstm_model:
-            lstm_path = save_path / "lstm_weather_model.h5"
+            lstm_path = save_path / "lstm_weather_model.keras"
             self.lstm_model.save(lstm_path)
             logger.info(f"Saved LSTM model to {lstm_path}")
-        
-        # Save XGBoost model
+            
+            try:
+                converter = tf.lite.TFLiteConverter.from_keras_model(self.lstm_model)
+                converter.optimizations = [tf.lite.Optimize.DEFAULT]
+                converter.target_spec.supported_types = [tf.float16]
+                tflite_path = save_path / "lstm_weather_model_fp16.tflite"
+                tflite_path.write_bytes(converter.convert())
+                logger.info(f"Saved TFLite FP16 LSTM model to {tflite_path}")
+            except Exception as e:
+                logger.warning(f"TFLite export skipped: {e}")
+        
+        # Save XGBoost model in the binary UBJSON format
         if self.xgb_model:
-            xgb_path = save_path / "xgboost_model.json"
+            xgb_path = save_path / "xgboost_model.ubj"
             self.xgb_model.save_model(xgb_path)
             logger.info(f"Saved XGBoost model to {xgb_path}")
         
-        # Save scaler
+        # Save scaler parameters as a raw array (row 0: mean, row 1: scale) so it loads with mmap_mode='r'
         if self.scaler:
-            import joblib
-            scaler_path = save_path / "feature_scaler.pkl"
-            joblib.dump(self.scaler, scaler_path)
+            scaler_path = save_path / "feature_scaler.npy"
+            np.save(scaler_path, np.stack([self.scaler.mean_, self.scaler.scale_]))
             logger.info(f"Saved scaler to {scaler_path}")
         
         # Save metadata
@@ -306,6 +496,12 @@ class KarnatakaPowerOutagePredictor:
             'grid_features': self.grid_features,
             'temporal_features': self.temporal_features,
             'contextual_features': self.contextual_features,
+            'artifacts': {
+                'lstm': 'lstm_weather_model.keras',
+                'lstm_tflite': 'lstm_weather_model_fp16.tflite',
+                'xgboost': 'xgboost_model.ubj',
+                'scaler': 'feature_scaler.npy'
+            },
             'training_timestamp': datetime.now().isoformat()
         }
         
@@ -317,8 +513,11 @@ class KarnatakaPowerOutagePredictor:
         logger.info(f"Saved metadata to {metadata_path}")
 
 
-def main():
-    """Main training pipeline for Karnataka power outage prediction."""
+def main(explain=False):
+    """Main training pipeline for Karnataka power outage prediction.
+    
+    Set explain to also compute SHAP values over the held-out split.
+    """
     try:
         logger.info("Starting Karnataka Power Outage Forecasting Training")
         
@@ -338,10 +537,12 @@ def main():
         lstm_history = predictor.train_lstm_model(X_seq, y_seq)
         
         # Train XGBoost model
-        xgb_model = predictor.train_xgboost_model(X, y)
+        xgb_model, xgb_test_proba, split_idx = predictor.train_xgboost_model(X, y)
         
-        # Generate explanations
-        shap_values, feature_importance = predictor.generate_shap_explanations(X)
+        # Feature importance from training gain; SHAP only when asked for
+        feature_importance = predictor.compute_feature_importance()
+        if explain:
+            predictor.generate_shap_explanations(X[split_idx:])
         
         # Save models
         predictor.save_models()
@@ -356,7 +557,7 @@ def main():
         print("\nModel Architecture:")
         print("  - LSTM: Weather sequence analysis (24-hour patterns)")
         print("  - XGBoost: Grid and contextual features")
-        print("  - SHAP: Explainability and feature importance")
+        print("  - Feature importance: XGBoost total gain (SHAP with --shap)")
         print("\nTop 5 Predictive Features:")
         for i, (_, row) in enumerate(feature_importance.head(5).iterrows(), 1):
             print(f"  {i}. {row['feature']}")
@@ -370,8 +571,7 @@ def main():
             'outage_rate': df['outage_occurred'].mean(),
             'model_performance': {
                 'lstm_accuracy': lstm_history.history['val_accuracy'][-1],
-                'xgb_auc': roc_auc_score(y[int(len(y)*0.8):], 
-                                       xgb_model.predict_proba(X[int(len(X)*0.8):])[:, 1])
+                'xgb_auc': roc_auc_score(y[split_idx:], xgb_test_proba)
             }
         }
         
@@ -381,4 +581,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Train the Karnataka power outage models")
+    parser.add_argument("--shap", action="store_true", help="also compute SHAP values for deep analysis")
+    args = parser.parse_args()
+    
+    main(explain=args.shap)
@@ -12,6 +12,13 @@ import numpy as np
 from datetime import datetime, timedelta
 import logging
 import argparse
+from joblib import Memory
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # Add src to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -25,93 +32,145 @@ from config.settings import settings
 setup_logging()
 logger = get_logger(__name__)
 
+# Generated datasets are cached on disk, keyed by the generator's arguments and source
+_synthetic_cache = Memory(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'synthetic'), verbose=0)
+
+# Sample counts at least this large score risk with the parallel JIT kernel
+_NUMBA_MIN_SAMPLES = 10000
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _risk_scores_jit(rainfall, wind_speed, lightning, storm_alert, load_factor,
+                         voltage_stability, historical_outages, maintenance_status,
+                         feeder_health, noise, threshold, risk_out, outage_out):
+        for i in prange(rainfall.size):
+            risk = max(0.0, (rainfall[i] - 10) * 1.5)
+            risk += max(0.0, (wind_speed[i] - 30) * 0.8)
+            risk += lightning[i] * 3
+            risk += storm_alert[i] * 15
+            
+            risk += max(0.0, (load_factor[i] - 0.7) * 50)
+            risk += max(0.0, (0.8 - voltage_stability[i]) * 40)
+            risk += min(historical_outages[i] * 2, 15.0)
+            risk += maintenance_status[i] * 10
+            risk += max(0.0, (0.7 - feeder_health[i]) * 30)
+            
+            risk = min(100.0, max(0.0, risk + noise[i]))
+            risk_out[i] = risk
+            outage_out[i] = 1 if risk > threshold[i] else 0
 
-def generate_synthetic_training_data(num_samples: int = 10000) -> dict:
+
+def _risk_scores(rainfall, wind_speed, lightning, storm_alert, load_factor,
+                 voltage_stability, historical_outages, maintenance_status,
+                 feeder_health, noise, threshold):
+    """Risk score and outage label per sample from its final weather hour and grid features."""
+    n = rainfall.size
+    if NUMBA_AVAILABLE and n >= _NUMBA_MIN_SAMPLES:
+        args = [np.ascontiguousarray(a, dtype=np.float64) for a in (
+            rainfall, wind_speed, lightning, storm_alert, load_factor, voltage_stability,
+            historical_outages, maintenance_status, feeder_health, noise, threshold
+        )]
+        risk_score = np.empty(n, dtype=np.float64)
+        outage_occurred = np.empty(n, dtype=np.int8)
+        _risk_scores_jit(*args, risk_score, outage_occurred)
+        return risk_score, outage_occurred
+    
+    risk_score = np.zeros(n)
+    
+    # Weather contribution
+    risk_score += np.maximum(0, (rainfall - 10) * 1.5)
+    risk_score += np.maximum(0, (wind_speed - 30) * 0.8)
+    risk_score += lightning * 3
+    risk_score += storm_alert * 15
+    
+    # Grid contribution
+    risk_score += np.maximum(0, (load_factor - 0.7) * 50)
+    risk_score += np.maximum(0, (0.8 - voltage_stability) * 40)
+    risk_score += np.minimum(historical_outages * 2, 15)
+    risk_score += maintenance_status * 10
+    risk_score += np.maximum(0, (0.7 - feeder_health) * 30)
+    
+    # Add some randomness
+    risk_score += noise
+    risk_score = np.clip(risk_score, 0, 100)
+    
+    # Determine if outage occurred (binary target)
+    outage_occurred = (risk_score > threshold).astype(np.int8)
+    return risk_score, outage_occurred
+
+
+@_synthetic_cache.cache
+def generate_synthetic_training_data(num_samples: int = 10000, seed: int = 42) -> dict:
     """Generate synthetic training data for demonstration."""
     logger.info(f"Generating {num_samples} synthetic training samples")
     
-    # Generate weather sequences (24-hour sequences)
-    np.random.seed(42)
+    rng = np.random.default_rng(seed)
+    hours = np.arange(24)
+    shape = (num_samples, 24)
     
-    weather_sequences = []
-    combined_features = []
+    # Generate 24-hour weather sequences, one row per sample
+    base_temp = rng.normal(25, 8, num_samples)  # Base temperature
+    base_humidity = rng.normal(60, 20, num_samples)
+    base_wind = rng.exponential(15, num_samples)
+    base_rain = rng.exponential(5, num_samples)
     
-    for i in range(num_samples):
-        # Generate 24-hour weather sequence
-        base_temp = np.random.normal(25, 8)  # Base temperature
-        base_humidity = np.random.normal(60, 20)
-        base_wind = np.random.exponential(15)
-        base_rain = np.random.exponential(5)
-        
-        sequence = []
-        for hour in range(24):
-            # Add hourly variations
-            temp_var = np.sin(hour * np.pi / 12) * 5  # Daily temperature cycle
-            temp = base_temp + temp_var + np.random.normal(0, 2)
-            
-            humidity = np.clip(base_humidity + np.random.normal(0, 10), 10, 100)
-            wind_speed = np.clip(base_wind + np.random.normal(0, 5), 0, 150)
-            rainfall = np.clip(base_rain + np.random.exponential(2), 0, 100)
-            lightning = np.random.poisson(1) if rainfall > 10 else 0
-            storm_alert = 1 if rainfall > 25 or wind_speed > 50 else 0
-            
-            sequence.append([temp, humidity, wind_speed, rainfall, lightning, storm_alert])
-        
-        weather_sequences.append(sequence)
-        
-        # Generate combined features for XGBoost training
-        # Weather embeddings (mock - in real training, these would come from LSTM)
-        weather_embeddings = np.random.normal(0, 1, 16)
-        
-        # Grid features
-        load_factor = np.random.beta(2, 2)  # Beta distribution for load factor
-        voltage_stability = np.random.beta(5, 2)  # Higher values more likely
-        historical_outages = np.random.poisson(3)
-        maintenance_status = np.random.choice([0, 1], p=[0.8, 0.2])
-        feeder_health = np.random.beta(5, 2)
-        
-        # Temporal features
-        hour_of_day = np.random.randint(0, 24)
-        day_of_week = np.random.randint(0, 7)
-        month = np.random.randint(1, 13)
-        season = (month - 1) // 3
-        
-        # Calculate risk score based on features
-        risk_score = 0
-        
-        # Weather contribution
-        risk_score += max(0, (sequence[-1][3] - 10) * 1.5)  # Rainfall
-        risk_score += max(0, (sequence[-1][2] - 30) * 0.8)  # Wind speed
-        risk_score += sequence[-1][4] * 3  # Lightning
-        risk_score += sequence[-1][5] * 15  # Storm alert
-        
-        # Grid contribution
-        risk_score += max(0, (load_factor - 0.7) * 50)
-        risk_score += max(0, (0.8 - voltage_stability) * 40)
-        risk_score += min(historical_outages * 2, 15)
-        risk_score += maintenance_status * 10
-        risk_score += max(0, (0.7 - feeder_health) * 30)
-        
-        # Add some randomness
-        risk_score += np.random.normal(0, 5)
-        risk_score = np.clip(risk_score, 0, 100)
-        
-        # Determine if outage occurred (binary target)
-        outage_occurred = 1 if risk_score > np.random.uniform(40, 80) else 0
-        
-        # Create feature vector
-        features = list(weather_embeddings) + [
-            load_factor, voltage_stability, historical_outages, 
-            maintenance_status, feeder_health, hour_of_day, 
-            day_of_week, month, season
-        ]
-        
-        combined_features.append(features + [outage_occurred, risk_score])
+    # Add hourly variations
+    temp_var = np.sin(hours * np.pi / 12) * 5  # Daily temperature cycle
+    temp = base_temp[:, None] + temp_var + rng.normal(0, 2, shape)
+    
+    humidity = np.clip(base_humidity[:, None] + rng.normal(0, 10, shape), 10, 100)
+    wind_speed = np.clip(base_wind[:, None] + rng.normal(0, 5, shape), 0, 150)
+    rainfall = np.clip(base_rain[:, None] + rng.exponential(2, shape), 0, 100)
+    lightning = np.where(rainfall > 10, rng.poisson(1, shape), 0)
+    storm_alert = ((rainfall > 25) | (wind_speed > 50)).astype(np.int8)
+    
+    weather_sequences = np.empty((num_samples, 24, 6), dtype=np.float32)
+    for f, values in enumerate((temp, humidity, wind_speed, rainfall, lightning, storm_alert)):
+        weather_sequences[:, :, f] = values
+    
+    # Generate combined features for XGBoost training
+    # Weather embeddings (mock - in real training, these would come from LSTM)
+    weather_embeddings = rng.normal(0, 1, (num_samples, 16))
+    
+    # Grid features
+    load_factor = rng.beta(2, 2, num_samples)  # Beta distribution for load factor
+    voltage_stability = rng.beta(5, 2, num_samples)  # Higher values more likely
+    historical_outages = rng.poisson(3, num_samples)
+    maintenance_status = (rng.random(num_samples) < 0.2).astype(np.int8)
+    feeder_health = rng.beta(5, 2, num_samples)
+    
+    # Temporal features
+    hour_of_day = rng.integers(0, 24, num_samples)
+    day_of_week = rng.integers(0, 7, num_samples)
+    month = rng.integers(1, 13, num_samples)
+    season = (month - 1) // 3
+    
+    # Calculate risk score and outage label from the last hour and grid state
+    noise = rng.normal(0, 5, num_samples)
+    threshold = rng.uniform(40, 80, num_samples)
+    risk_score, outage_occurred = _risk_scores(
+        rainfall[:, -1], wind_speed[:, -1], lightning[:, -1], storm_alert[:, -1],
+        load_factor, voltage_stability, historical_outages, maintenance_status,
+        feeder_health, noise, threshold
+    )
+    
+    # Create feature matrix, one column slice per feature
+    combined_features = np.empty((num_samples, 27), dtype=np.float64)
+    combined_features[:, :16] = weather_embeddings
+    for col, values in enumerate((
+        load_factor, voltage_stability, historical_outages,
+        maintenance_status, feeder_health, hour_of_day,
+        day_of_week, month, season,
+        outage_occurred, risk_score
+    ), start=16):
+        combined_features[:, col] = values
     
     # Convert to DataFrames
     weather_df = pd.DataFrame(
-        [seq for seq in weather_sequences],
-        columns=[f'hour_{i}' for i in range(24)]
+        weather_sequences.reshape(num_samples, -1),
+        columns=[f'hour_{h}_f{f}' for h in range(24) for f in range(6)],
+        copy=False
     )
     
     feature_columns = (
@@ -121,7 +180,7 @@ def generate_synthetic_training_data(num_samples: int = 10000) -> dict:
          'day_of_week', 'month', 'season', 'outage_occurred', 'risk_score']
     )
     
-    combined_df = pd.DataFrame(combined_features, columns=feature_columns)
+    combined_df = pd.DataFrame(combined_features, columns=feature_columns, copy=False)
     
     logger.info("Synthetic training data generated successfully")
     
@@ -212,6 +271,18 @@ async def evaluate_model(model_path: str, test_data_path: str = None):
         raise
 
 
+async def run_pipeline(args):
+    """Train and, if requested, evaluate the model on one event loop."""
+    training_results = await train_model(args.data, args.save)
+    
+    # Evaluate if requested
+    if args.evaluate:
+        model_path = args.model_path or args.save or os.path.join(os.path.dirname(__file__), 'models', 'trained')
+        await evaluate_model(model_path)
+    
+    return training_results
+
+
 def main():
     """Main training script."""
     parser = argparse.ArgumentParser(description='Train the Power Outage Forecasting Model')
@@ -223,13 +294,8 @@ def main():
     args = parser.parse_args()
     
     try:
-        # Train model
-        training_results = asyncio.run(train_model(args.data, args.save))
-        
-        # Evaluate if requested
-        if args.evaluate:
-            model_path = args.model_path or args.save or os.path.join(os.path.dirname(__file__), 'models', 'trained')
-            asyncio.run(evaluate_model(model_path))
+        # Train (and optionally evaluate) model
+        training_results = asyncio.run(run_pipeline(args))
         
         print("\nTraining completed successfully!")
         
@@ -263,7 +329,10 @@ data = {
     'power_outage': np.random.binomial(1, 0.05, n_samples)
 }
 
-df = pd.DataFrame(data)
-df.to_csv('data/synthetic_training_data.csv', index=False)
+df = pd.DataFrame(data).astype({
+    'temperature': 'float32', 'humidity': 'float32', 'wind_speed': 'float32', 'rainfall': 'float32',
+    'lightning_strikes': 'int8', 'storm_alert': 'int8', 'power_outage': 'int8'
+})
+df.to_parquet('data/synthetic_training_data.parquet', engine='pyarrow', compression='zstd', index=False)
 print('Fixed synthetic data generated with required columns')
 "
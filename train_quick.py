@@ -7,14 +7,24 @@ import os
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.ensemble import ExtraTreesClassifier, HistGradientBoostingClassifier
 from sklearn.metrics import classification_report, accuracy_score, roc_auc_score
 import joblib
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+# Compact dtypes for the dataset columns, applied at load time
+DATASET_DTYPES = {
+    'city': 'category', 'escom_zone': 'category',
+    'priority_tier': 'int8', 'hour_of_day': 'int8', 'day_of_week': 'int8',
+    'month': 'int8', 'season': 'int8', 'storm_alert': 'int8', 'outage_occurred': 'int8',
+    'lightning_strikes': 'int16', 'historical_outages': 'int16',
+    'temperature': 'float32', 'humidity': 'float32', 'wind_speed': 'float32', 'rainfall': 'float32',
+    'load_factor': 'float32', 'voltage_stability': 'float32',
+    'feeder_health': 'float32', 'transformer_load': 'float32'
+}
+
 print("QUICK KARNATAKA MODEL TRAINING")
 print("=" * 50)
 
@@ -23,30 +33,35 @@ Path("models").mkdir(exist_ok=True)
 
 # Load Karnataka dataset
 print("Loading Karnataka dataset...")
-data_file = "data/karnataka_power_outage_dataset.csv"
-
-if not os.path.exists(data_file):
+data_file = Path("data/karnataka_power_outage_dataset.csv")
+parquet_file = data_file.with_suffix(".parquet")
+
+if parquet_file.exists():
+    df = pd.read_parquet(parquet_file, engine='pyarrow')
+    df = df.astype({col: dtype for col, dtype in DATASET_DTYPES.items() if col in df.columns})
+elif data_file.exists():
+    df = pd.read_csv(data_file, engine='pyarrow', dtype=DATASET_DTYPES, parse_dates=['timestamp'])
+else:
     print(f"Dataset not found: {data_file}")
     print("Run: python data/karnataka_data_loader.py")
     exit(1)
 
-df = pd.read_csv(data_file)
 print(f"Loaded dataset: {len(df):,} records")
 print(f"Outage rate: {df['outage_occurred'].mean():.2%}")
 
 # Prepare features
 print("\nPreparing features...")
 
-# Encode categorical variables
-le_city = LabelEncoder()
-df['city_encoded'] = le_city.fit_transform(df['city'])
-
-le_zone = LabelEncoder()
-df['zone_encoded'] = le_zone.fit_transform(df['escom_zone'])
+# Encode categorical variables; the codes go straight into the feature matrix
+df['city'] = df['city'].astype('category')
+df['escom_zone'] = df['escom_zone'].astype('category')
 
-# Extract time features
-df['timestamp'] = pd.to_datetime(df['timestamp'])
-df['is_weekend'] = (df['day_of_week'] >= 5).astype(int)
+# Features computed from other columns rather than stored in df
+derived_features = {
+    'city_encoded': df['city'].cat.codes,
+    'zone_encoded': df['escom_zone'].cat.codes,
+    'is_weekend': df['day_of_week'] >= 5,
+}
 
 # Select features for training
 feature_columns = [
@@ -57,8 +72,11 @@ feature_columns = [
     'transformer_load', 'feeder_health', 'is_monsoon', 'is_summer'
 ]
 
-# Prepare data
-X = df[feature_columns].fillna(0)
+# Prepare data as one float32 matrix
+X = np.empty((len(df), len(feature_columns)), dtype=np.float32)
+for i, col in enumerate(feature_columns):
+    X[:, i] = derived_features[col] if col in derived_features else df[col]
+X[np.isnan(X)] = 0
 y = df['outage_occurred']
 
 print(f"Features: {len(feature_columns)} columns")
@@ -73,81 +91,86 @@ X_train, X_test, y_train, y_test = train_test_split(
 print(f"Training set: {len(X_train):,} samples")
 print(f"Test set: {len(X_test):,} samples")
 
-# Scale features
-print("\n📏 Scaling features...")
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
+# Tree splits ignore feature scale, so the float32 matrix is used unscaled
+y_train = y_train.to_numpy(dtype=np.int8)
 
 # Train ensemble models
 print("\n🤖 Training ensemble models...")
 
-# Random Forest
-print("🌳 Training Random Forest...")
-rf_model = RandomForestClassifier(
-    n_estimators=100,
+# Extra Trees (random split thresholds, half-size bootstrap sample per tree)
+print("🌳 Training Extra Trees...")
+rf_model = ExtraTreesClassifier(
+    n_estimators=200,
     max_depth=15,
+    min_samples_leaf=5,
+    max_features='sqrt',
+    bootstrap=True,
+    max_samples=0.5,
     random_state=42,
     n_jobs=-1
 )
-rf_model.fit(X_train_scaled, y_train)
+rf_model.fit(X_train, y_train)
 
 # Gradient Boosting
 print("Training Gradient Boosting...")
-gb_model = GradientBoostingClassifier(
-    n_estimators=100,
+gb_model = HistGradientBoostingClassifier(
+    max_iter=200,
     max_depth=6,
     learning_rate=0.1,
+    early_stopping=True,
     random_state=42
 )
-gb_model.fit(X_train_scaled, y_train)
+gb_model.fit(X_train, y_train)
 
 # Create ensemble predictor
 class KarnatakaEnsembleModel:
-    def __init__(self, rf_model, gb_model, scaler, feature_columns):
+    def __init__(self, rf_model, gb_model, feature_columns):
         self.rf_model = rf_model
         self.gb_model = gb_model
-        self.scaler = scaler
         self.feature_columns = feature_columns
-        self.le_city = le_city
-        self.le_zone = le_zone
+        # Category at position i was encoded as i
+        self.city_categories = df['city'].cat.categories
+        self.zone_categories = df['escom_zone'].cat.categories
     
     def predict_proba(self, X):
         """Predict outage probabilities."""
         if isinstance(X, list):
             X = np.array(X).reshape(1, -1)
         
-        X_scaled = self.scaler.transform(X)
+        # Convert once; both models read the same float32 matrix
+        X = np.ascontiguousarray(X, dtype=np.float32)
         
-        # Get predictions from both models
-        rf_proba = self.rf_model.predict_proba(X_scaled)
-        gb_proba = self.gb_model.predict_proba(X_scaled)
-        
-        # Ensemble average
-        ensemble_proba = (rf_proba + gb_proba) / 2
+        # Ensemble average of both models' probabilities
+        ensemble_proba = self.rf_model.predict_proba(X)
+        ensemble_proba += self.gb_model.predict_proba(X)
+        ensemble_proba *= 0.5
         return ensemble_proba
     
     def predict(self, X):
         """Predict outage (binary)."""
+        return self.predict_with_proba(X)[0]
+    
+    def predict_with_proba(self, X):
+        """Predict outage (binary) together with the probabilities it was thresholded from."""
         proba = self.predict_proba(X)
-        return (proba[:, 1] > 0.5).astype(int)
+        return (proba[:, 1] > 0.5).astype(int), proba
 
 # Create ensemble
-ensemble_model = KarnatakaEnsembleModel(rf_model, gb_model, scaler, feature_columns)
+ensemble_model = KarnatakaEnsembleModel(rf_model, gb_model, feature_columns)
 
 # Evaluate models
 print("\nEVALUATING MODELS...")
 
-# Test predictions
-rf_pred = rf_model.predict(X_test_scaled)
-gb_pred = gb_model.predict(X_test_scaled)
-ensemble_pred = ensemble_model.predict(X_test_scaled)
+# Test predictions; labels are thresholded from the probabilities rather than predicted again
+rf_proba = rf_model.predict_proba(X_test)[:, 1]
+gb_proba = gb_model.predict_proba(X_test)[:, 1]
+ensemble_pred, ensemble_proba = ensemble_model.predict_with_proba(X_test)
+ensemble_proba = ensemble_proba[:, 1]
 
-rf_proba = rf_model.predict_proba(X_test_scaled)[:, 1]
-gb_proba = gb_model.predict_proba(X_test_scaled)[:, 1]
-ensemble_proba = ensemble_model.predict_proba(X_test_scaled)[:, 1]
+rf_pred = (rf_proba > 0.5).astype(np.int8)
+gb_pred = (gb_proba > 0.5).astype(np.int8)
 
-print("🌳 Random Forest Results:")
+print("🌳 Extra Trees Results:")
 print(f"   Accuracy: {accuracy_score(y_test, rf_pred):.3f}")
 print(f"   ROC-AUC: {roc_auc_score(y_test, rf_proba):.3f}")
 
@@ -169,14 +192,14 @@ for i, importance in enumerate(feature_importance):
 # Save model
 print("\n💾 Saving model...")
 model_path = "models/karnataka_outage_model.joblib"
-joblib.dump(ensemble_model, model_path)
+joblib.dump(ensemble_model, model_path, compress=3)
 
 print(f"Model saved to: {model_path}")
 print(f"Model size: {os.path.getsize(model_path) / 1024 / 1024:.1f} MB")
 
 # Test prediction example
 print("\n🔮 TESTING PREDICTION...")
-sample_data = X_test.iloc[0:1].values
+sample_data = X_test[0:1]
 prediction = ensemble_model.predict_proba(sample_data)
 print(f"Sample prediction: {prediction[0][1]:.3f} outage probability")
 
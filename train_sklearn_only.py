@@ -5,44 +5,63 @@ Quick retrain using only sklearn models for better compatibility.
 
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, VotingClassifier
-from sklearn.preprocessing import StandardScaler
+from sklearn.ensemble import ExtraTreesClassifier, HistGradientBoostingClassifier, VotingClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, roc_auc_score
 import joblib
 import os
+from pathlib import Path
+
+# Let assign() and column selections share buffers instead of copying the frame
+pd.set_option('mode.copy_on_write', True)
+
+# Compact dtypes for the dataset columns, applied at load time
+DATASET_DTYPES = {
+    'city': 'category', 'escom_zone': 'category',
+    'priority_tier': 'int8', 'hour_of_day': 'int8', 'day_of_week': 'int8',
+    'month': 'int8', 'season': 'int8', 'storm_alert': 'int8', 'outage_occurred': 'int8',
+    'lightning_strikes': 'int16', 'historical_outages': 'int16',
+    'temperature': 'float32', 'humidity': 'float32', 'wind_speed': 'float32', 'rainfall': 'float32',
+    'load_factor': 'float32', 'voltage_stability': 'float32',
+    'feeder_health': 'float32', 'transformer_load': 'float32'
+}
 
 print("🚀 RETRAINING KARNATAKA MODEL WITH PURE SKLEARN")
 print("=" * 60)
 
 # Load dataset
 print("📊 Loading Karnataka dataset...")
-df = pd.read_csv('data/karnataka_power_outage_dataset.csv')
+data_file = Path("data/karnataka_power_outage_dataset.csv")
+parquet_file = data_file.with_suffix(".parquet")
+if parquet_file.exists():
+    df = pd.read_parquet(parquet_file, engine='pyarrow')
+    df = df.astype({col: dtype for col, dtype in DATASET_DTYPES.items() if col in df.columns})
+else:
+    df = pd.read_csv(data_file, engine='pyarrow', dtype=DATASET_DTYPES, parse_dates=['timestamp'])
 print(f"✓ Loaded {len(df):,} records")
 
 # Prepare features (same as before)
 print("🔧 Preparing features...")
-# Use existing columns where available
-if 'hour_of_day' not in df.columns:
-    df['hour_of_day'] = pd.to_datetime(df['timestamp']).dt.hour
-if 'day_of_week' not in df.columns:
-    df['day_of_week'] = pd.to_datetime(df['timestamp']).dt.dayofweek
-if 'month' not in df.columns:
-    df['month'] = pd.to_datetime(df['timestamp']).dt.month
-if 'season' not in df.columns:
-    df['season'] = df['month'].map({12: 0, 1: 0, 2: 0, 3: 1, 4: 1, 5: 1, 6: 2, 7: 2, 8: 2, 9: 3, 10: 3, 11: 3})
-if 'is_monsoon' not in df.columns:
-    df['is_monsoon'] = df['month'].isin([6, 7, 8, 9]).astype(int)
-if 'is_summer' not in df.columns:
-    df['is_summer'] = df['month'].isin([3, 4, 5]).astype(int)
-
-# City encoding
-city_map = {city: i for i, city in enumerate(df['city'].unique())}
-df['city_encoded'] = df['city'].map(city_map)
-
-# ESCOM zone encoding
-escom_map = {escom: i for i, escom in enumerate(df['escom_zone'].unique())}
-df['escom_encoded'] = df['escom_zone'].map(escom_map)
+# Calendar features, used only where the dataset lacks them (evaluated in order)
+calendar_features = {
+    'hour_of_day': lambda d: d['timestamp'].dt.hour,
+    'day_of_week': lambda d: d['timestamp'].dt.dayofweek,
+    'month': lambda d: d['timestamp'].dt.month,
+    'season': lambda d: (d['month'].to_numpy(dtype=np.int8) % 12) // 3,  # Dec-Feb 0, Mar-May 1, Jun-Aug 2, Sep-Nov 3
+    'is_monsoon': lambda d: d['month'].between(6, 9).astype(np.int8),
+    'is_summer': lambda d: d['month'].between(3, 5).astype(np.int8),
+}
+
+# Add missing calendar features in one assign
+df = df.assign(**{col: fn for col, fn in calendar_features.items() if col not in df.columns})
+
+# City/ESCOM zone codes go straight into the feature matrix instead of df
+encoded_features = {
+    'city_encoded': df['city'].cat.codes,
+    'escom_encoded': df['escom_zone'].cat.codes,
+}
+city_map = {city: i for i, city in enumerate(df['city'].cat.categories)}
+escom_map = {escom: i for i, escom in enumerate(df['escom_zone'].cat.categories)}
 
 # Feature columns
 feature_columns = [
@@ -52,8 +71,10 @@ feature_columns = [
     'is_monsoon', 'is_summer', 'city_encoded', 'escom_encoded'
 ]
 
-# Prepare data
-X = df[feature_columns].copy()
+# Prepare data as one float32 matrix
+X = np.empty((len(df), len(feature_columns)), dtype=np.float32)
+for i, col in enumerate(feature_columns):
+    X[:, i] = encoded_features[col] if col in encoded_features else df[col]
 y = df['outage_occurred'].astype(int)
 
 print(f"✓ Features: {len(feature_columns)}")
@@ -63,52 +84,56 @@ print(f"✓ Outage rate: {y.mean():.1%}")
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
 print(f"✓ Train: {len(X_train):,}, Test: {len(X_test):,}")
 
-# Scale features
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
+# Tree splits ignore feature scale, so the float32 matrix is used unscaled
+y_train = y_train.to_numpy(dtype=np.int8)
 
-# Train models
-print("\n🌳 Training Random Forest...")
-rf_model = RandomForestClassifier(
-    n_estimators=100,
+# Define models; Extra Trees draw random split thresholds on a half-size bootstrap sample per tree
+rf_model = ExtraTreesClassifier(
+    n_estimators=200,
     max_depth=15,
     min_samples_split=10,
     min_samples_leaf=5,
+    max_features='sqrt',
+    bootstrap=True,
+    max_samples=0.5,
     random_state=42,
     n_jobs=-1
 )
-rf_model.fit(X_train_scaled, y_train)
 
-print("⚡ Training Gradient Boosting...")
-gb_model = GradientBoostingClassifier(
-    n_estimators=100,
+gb_model = HistGradientBoostingClassifier(
+    max_iter=200,
     max_depth=8,
     learning_rate=0.1,
+    early_stopping=True,
     random_state=42
 )
-gb_model.fit(X_train_scaled, y_train)
 
-print("🎯 Creating Ensemble...")
+# The ensemble fits its own clones of both models, one joblib worker each
+print("\n🎯 Training Extra Trees and Gradient Boosting ensemble...")
 ensemble_model = VotingClassifier(
     estimators=[
         ('rf', rf_model),
         ('gb', gb_model)
     ],
-    voting='soft'
+    voting='soft',
+    n_jobs=2
 )
-ensemble_model.fit(X_train_scaled, y_train)
+ensemble_model.fit(X_train, y_train)
+rf_model = ensemble_model.named_estimators_['rf']
+gb_model = ensemble_model.named_estimators_['gb']
 
 # Evaluate
 print("\n📈 EVALUATION RESULTS:")
-rf_pred = rf_model.predict(X_test_scaled)
-rf_proba = rf_model.predict_proba(X_test_scaled)[:, 1]
-gb_pred = gb_model.predict(X_test_scaled)
-gb_proba = gb_model.predict_proba(X_test_scaled)[:, 1]
-ensemble_pred = ensemble_model.predict(X_test_scaled)
-ensemble_proba = ensemble_model.predict_proba(X_test_scaled)[:, 1]
-
-print(f"🌳 Random Forest: Acc={accuracy_score(y_test, rf_pred):.3f}, AUC={roc_auc_score(y_test, rf_proba):.3f}")
+# One probability pass per model; labels are thresholded from it and unweighted
+# soft voting is the plain mean of the two models' probabilities
+rf_proba = rf_model.predict_proba(X_test)[:, 1]
+gb_proba = gb_model.predict_proba(X_test)[:, 1]
+ensemble_proba = (rf_proba + gb_proba) / 2
+rf_pred = (rf_proba > 0.5).astype(np.int8)
+gb_pred = (gb_proba > 0.5).astype(np.int8)
+ensemble_pred = (ensemble_proba > 0.5).astype(np.int8)
+
+print(f"🌳 Extra Trees: Acc={accuracy_score(y_test, rf_pred):.3f}, AUC={roc_auc_score(y_test, rf_proba):.3f}")
 print(f"⚡ Gradient Boost: Acc={accuracy_score(y_test, gb_pred):.3f}, AUC={roc_auc_score(y_test, gb_proba):.3f}")
 print(f"🎯 Ensemble: Acc={accuracy_score(y_test, ensemble_pred):.3f}, AUC={roc_auc_score(y_test, ensemble_proba):.3f}")
 
@@ -118,7 +143,6 @@ os.makedirs("models", exist_ok=True)
 
 model_package = {
     'ensemble_model': ensemble_model,
-    'scaler': scaler,
     'feature_columns': feature_columns,
     'city_map': city_map,
     'escom_map': escom_map,
@@ -131,7 +155,7 @@ model_package = {
 }
 
 model_path = "models/karnataka_sklearn_model.joblib"
-joblib.dump(model_package, model_path)
+joblib.dump(model_package, model_path, compress=3)
 
 print(f"✅ Model package saved to: {model_path}")
 print(f"📦 Size: {os.path.getsize(model_path) / 1024 / 1024:.1f} MB")
@@ -139,7 +163,7 @@ print(f"📦 Size: {os.path.getsize(model_path) / 1024 / 1024:.1f} MB")
 # Test loading
 print("\n🔬 Testing model loading...")
 loaded_package = joblib.load(model_path)
-test_pred = loaded_package['ensemble_model'].predict_proba(X_test_scaled[:1])
+test_pred = loaded_package['ensemble_model'].predict_proba(X_test[:1])
 print(f"✓ Loaded model test: {test_pred[0][1]*100:.1f}% outage risk")
 
 print("\n🎉 PURE SKLEARN MODEL READY!")